@@ -6,9 +6,10 @@ The module handles:
 - Automatic decryption of sensitive data
 - Hierarchical data structure management
 - Test-specific data retrieval
+- Lazy loading on first access, cached across instances until the file changes
 
 Key features:
-- YAML-based test data storage
+- YAML-based test data storage, with fast parsing of .json files
 - Automatic secret decryption
 - Hierarchical data access
 - Secure handling of sensitive information
@@ -18,10 +19,15 @@ Usage:
     properties = FrameworkProperties(test_data_file="test_data.yml", encryption_key="key")
     manager = TestDataManager(properties)
     test_data = manager.get_test_data("login_test")
+
+    # Overlap loading with other I/O, e.g. locator files
+    await asyncio.gather(manager.load_async(), locator_manager.load_async())
 """
-import os
+import asyncio
+import copy
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 import unittest
 from unittest.mock import Mock, patch, mock_open
 
@@ -30,42 +36,96 @@ import yaml
 from lib.models import FrameworkProperties
 from lib.utils.cryptography import SecretManager
 
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_FRAMEWORK_ROOT = Path(__file__).resolve().parent.parent
+_DATA_CACHE: Dict[Tuple[str, str], Tuple[int, Dict[str, Any]]] = {}
+
+@lru_cache(maxsize=8)
+def _secret_manager_for(key: str) -> SecretManager:
+    """Returns a shared SecretManager for the given encryption key"""
+    return SecretManager(key)
+
 class DataManager:
     """Class for managing test data"""
     def __init__(self, properties: FrameworkProperties):
-        self.data_file = Path(os.path.join(
-            os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-            properties.test_data_file
-        ))
-        self.secret_manager = SecretManager(properties.encryption_key)
-        self._data = self._load_data()
+        self.data_file = _FRAMEWORK_ROOT / properties.test_data_file
+        self.secret_manager = _secret_manager_for(properties.encryption_key)
+        self._encryption_key = properties.encryption_key
+
+    @cached_property
+    def _data(self) -> Dict[str, Any]:
+        """Test data, loaded on first access"""
+        return self._load_cached_data()
+
+    def _load_cached_data(self) -> Dict[str, Any]:
+        """Load the test data, reusing the processed data while the file is unchanged"""
+        try:
+            mtime = self.data_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            return self._load_data()
+
+        key = (str(self.data_file), self._encryption_key)
+        cached = _DATA_CACHE.get(key)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, self._load_data())
+            _DATA_CACHE[key] = cached
+        return cached[1]
 
     def _load_data(self) -> Dict[str, Any]:
         """Load and process the test data file"""
         if not self.data_file.exists():
             raise FileNotFoundError(f"Test data file not found: {self.data_file}")
 
-        with open(self.data_file, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-
-        return self._process_secrets(data)
+        with open(self.data_file, 'rb') as f:
+            content = f.read()
 
-    def _process_secrets(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Recursively process encrypted secrets in the data"""
-        if isinstance(data, dict):
-            return {
-                key: self._process_secrets(value)
-                for key, value in data.items()
-            }
+        return self._process_secrets(self._parse_data(content))
 
-        if isinstance(data, list):
-            return [self._process_secrets(item) for item in data]
+    def _parse_data(self, content: bytes) -> Dict[str, Any]:
+        """Parse the data file content, using orjson for .json files"""
+        if orjson and self.data_file.suffix == '.json':
+            return orjson.loads(content)
+        return yaml.load(content, Loader=_Loader)
 
-        if isinstance(data, str) and data.startswith('ENC['):
-            return self.secret_manager.decrypt(data[4:-1])
+    def _process_secrets(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Decrypt all encrypted secrets in the data in place in a single batch"""
+        targets = []
+        tokens = []
+        stack = [data] if isinstance(data, (dict, list)) else []
+        while stack:
+            node = stack.pop()
+            items = node.items() if isinstance(node, dict) else enumerate(node)
+            for key, value in items:
+                if isinstance(value, str):
+                    if (
+                        len(value) > 5 and value[0] == 'E' and value[-1] == ']'
+                        and value.startswith('ENC[')
+                    ):
+                        targets.append((node, key))
+                        tokens.append(value[4:-1])
+                elif isinstance(value, (dict, list)):
+                    stack.append(value)
 
+        if targets:
+            secrets = self.secret_manager.decrypt_many(tokens)
+            for (node, key), secret in zip(targets, secrets):
+                node[key] = secret
         return data
 
+    async def load_async(self) -> Dict[str, Any]:
+        """Load the test data in a worker thread so other loads can overlap with it"""
+        self._data = await asyncio.to_thread(self._load_cached_data)
+        return self._data
+
     def get_test_data(self, test_name: str) -> Dict[str, Any]:
         """Get test data for a specific test"""
         return self._data.get(test_name, {})
@@ -87,6 +147,10 @@ class TestDataManager(unittest.TestCase):
             """Expose protected method for testing"""
             return self._process_secrets(data)
 
+        def parse_data(self, content):
+            """Expose protected method for testing"""
+            return self._parse_data(content)
+
         @property
         def data(self):
             """Expose protected _data property for testing"""
@@ -126,6 +190,11 @@ class TestDataManager(unittest.TestCase):
             }
         }
 
+    @staticmethod
+    def fake_decrypt_many(tokens):
+        """Stand-in for SecretManager.decrypt_many that returns a fixed value per token"""
+        return ['decrypted'] * len(tokens)
+
     def test_get_test_data(self):
         """Test getting test data for a specific test"""
         self.manager.data = self.test_data
@@ -158,13 +227,70 @@ class TestDataManager(unittest.TestCase):
     )
     def test_load_data(self):
         """Test loading data from file"""
-        with patch.object(SecretManager, 'decrypt', return_value='decrypted'):
+        with patch.object(SecretManager, 'decrypt_many', side_effect=self.fake_decrypt_many):
             data = self.manager.load_data()
             self.assertIsInstance(data, dict)
             self.assertIn("login_test", data)
             self.assertEqual(data["login_test"]["username"], "test_user")
             self.assertEqual(data["login_test"]["password"], "decrypted")
 
+    def test_load_data_cached_across_instances(self):
+        """Test that unchanged data files are loaded once across instances"""
+        properties = Mock(spec=FrameworkProperties)
+        properties.test_data_file = "test_data.yml"
+        properties.encryption_key = "m8e0EMDdBnV0I6SGz-H7v1CKgQhLSnNcEIS5K4-WD1o="
+        _DATA_CACHE.clear()
+
+        with patch.object(DataManager, '_load_data', return_value={"cached": True}) as load:
+            first = DataManager(properties)
+            second = DataManager(properties)
+            load.assert_not_called()
+            self.assertIs(first.get_all_test_data(), second.get_all_test_data())
+
+        load.assert_called_once()
+        _DATA_CACHE.clear()
+
+    def test_parse_data_json_and_yaml(self):
+        """Test parsing of JSON-compatible and YAML-only content of a YAML data file"""
+        expected = {"login_test": {"username": "test_user", "retries": 3}}
+        json_content = b'{"login_test": {"username": "test_user", "retries": 3}}'
+        yaml_content = b"login_test:\n  username: test_user\n  retries: 3\n"
+
+        self.assertEqual(self.manager.parse_data(json_content), expected)
+        self.assertEqual(self.manager.parse_data(yaml_content), expected)
+
+    def test_parse_data_yaml_file_keeps_yaml_rules(self):
+        """Test that JSON-compatible content of a YAML data file is parsed as YAML"""
+        self.assertEqual(self.manager.parse_data(b'{"value": 1e3}'), {"value": "1e3"})
+
+    @unittest.skipIf(orjson is None, "orjson is not installed")
+    def test_parse_data_json_file_uses_orjson(self):
+        """Test that .json data files are parsed with orjson"""
+        properties = Mock(spec=FrameworkProperties)
+        properties.test_data_file = "test_data.json"
+        properties.encryption_key = "m8e0EMDdBnV0I6SGz-H7v1CKgQhLSnNcEIS5K4-WD1o="
+        manager = self.TestableDataManager(properties)
+
+        with patch.object(yaml, 'load') as yaml_load:
+            self.assertEqual(manager.parse_data(b'{"value": 1e3}'), {"value": 1000.0})
+        yaml_load.assert_not_called()
+
+    def test_load_async(self):
+        """Test loading data asynchronously"""
+        _DATA_CACHE.clear()
+        with patch.object(DataManager, '_load_data', return_value=self.test_data):
+            data = asyncio.run(self.manager.load_async())
+        self.assertEqual(data, self.test_data)
+        self.assertIs(self.manager.get_all_test_data(), data)
+        _DATA_CACHE.clear()
+
+    def test_secret_manager_shared_per_key(self):
+        """Test that managers with the same encryption key share a SecretManager"""
+        properties = Mock(spec=FrameworkProperties)
+        properties.test_data_file = "test_data.yml"
+        properties.encryption_key = "m8e0EMDdBnV0I6SGz-H7v1CKgQhLSnNcEIS5K4-WD1o="
+        self.assertIs(DataManager(properties).secret_manager, self.manager.secret_manager)
+
     @patch('builtins.open', side_effect=FileNotFoundError)
     def test_load_data_file_not_found(self, _):
         """Test loading data when file not found"""
@@ -182,13 +308,26 @@ class TestDataManager(unittest.TestCase):
             "list": ["plain", "ENC[list_encrypted]"]
         }
 
-        with patch.object(SecretManager, 'decrypt', return_value='decrypted'):
+        with patch.object(SecretManager, 'decrypt_many', side_effect=self.fake_decrypt_many):
             processed = self.manager.process_secrets(test_data)
+            self.assertIs(processed, test_data)
             self.assertEqual(processed["plain"], "text")
             self.assertEqual(processed["secret"], "decrypted")
             self.assertEqual(processed["nested"]["secret"], "decrypted")
             self.assertEqual(processed["list"][1], "decrypted")
 
+    def test_process_secrets_deeply_nested(self):
+        """Test processing of data nested deeper than the recursion limit"""
+        test_data = {"secret": "ENC[encrypted]"}
+        for _ in range(5000):
+            test_data = {"nested": [test_data]}
+
+        with patch.object(SecretManager, 'decrypt_many', side_effect=self.fake_decrypt_many):
+            node = self.manager.process_secrets(test_data)
+        while "nested" in node:
+            node = node["nested"][0]
+        self.assertEqual(node["secret"], "decrypted")
+
     def test_process_secrets_no_encryption(self):
         """Test processing of data without encrypted values"""
         test_data = {
@@ -196,8 +335,17 @@ class TestDataManager(unittest.TestCase):
             "nested": {
                 "value": "plain"
             },
-            "list": ["plain", "also_plain"]
+            "list": ["plain", "also_plain", "ENCODED", "ENC[unterminated", "ENC[]"]
         }
 
-        processed = self.manager.process_secrets(test_data)
+        with patch.object(SecretManager, 'decrypt_many') as decrypt_many:
+            processed = self.manager.process_secrets(copy.deepcopy(test_data))
         self.assertEqual(processed, test_data)
+        decrypt_many.assert_not_called()
+
+    def test_process_secrets_decrypts_values(self):
+        """Test processing of real encrypted values with the configured key"""
+        processed = self.manager.process_secrets(self.test_data)
+        self.assertEqual(processed["login_test"]["password"], "testuser")
+        self.assertEqual(processed["login_test"]["settings"]["api_key"], "apikey")
+        self.assertEqual(processed["search_test"], self.test_data["search_test"])
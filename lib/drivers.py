@@ -6,34 +6,39 @@ The module handles:
 - Concrete implementations for Android and iOS drivers
 - Local and remote driver configurations
 - Driver initialization with platform-specific options
+- One driver session shared across tests, with the app reset between them
 
 Key features:
 - Support for Android (UiAutomator2) and iOS (XCUITest) platforms
 - Local and remote (cloud provider) driver configurations
 - Property-based driver configuration
 - Type-safe driver initialization
+- Session lifecycle: background creation, dead session recovery and age-based recycling
 
 Usage:
     properties = AppiumProperties(...)
     driver = LocalAndroidWebDriver(properties)
     driver_instance = driver.get_driver()
 """
+import time
+import warnings
 from abc import ABC, abstractmethod
-from typing import cast
-
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from unittest.mock import Mock, PropertyMock
 import pytest
 from appium import webdriver as appium_webdriver
-from appium.options.android import UiAutomator2Options
-from appium.options.ios import XCUITestOptions
 from appium.webdriver.appium_connection import AppiumConnection
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.remote.client_config import ClientConfig
-from tests.conftest import (
-    ApplicationType,
-    AppiumProperties,
-    ExecutionProperties,
-    PlatformType,
-    ProviderType
-)
+
+from lib.models import AppiumProperties, ExecutionProperties
+from lib.types import ApplicationType, PlatformType, ProviderType
+
+@lru_cache(maxsize=16)
+def _connection_for(url: str) -> AppiumConnection:
+    """Returns a shared Appium connection for the given server URL"""
+    return AppiumConnection(client_config=ClientConfig(remote_server_addr=url))
 
 class WebDriver(ABC):
     """Abstract class representing a web driver"""
@@ -51,35 +56,41 @@ class WebDriver(ABC):
 class LocalAndroidWebDriver(WebDriver):
     """Class representing a local Android web driver"""
     def get_driver(self) -> appium_webdriver.Remote:
+        from appium.options.android import UiAutomator2Options
+
         options = UiAutomator2Options()
         options.udid = self.properties.device_udid
         options.platform_version = self.properties.platform_version
         options.app_package = self.properties.application_id
         options.app_activity = self.properties.application_launch_activity
-        client_config = ClientConfig(remote_server_addr=self.properties.url)
-        appium_executor = AppiumConnection(client_config=client_config)
+        if self.properties.system_port:
+            options.system_port = self.properties.system_port
         return appium_webdriver.Remote(
-            command_executor=appium_executor,
+            command_executor=_connection_for(self.properties.url),
             options=options
         )
 
 class LocalIOSWebDriver(WebDriver):
     """Class representing a local iOS web driver"""
     def get_driver(self) -> appium_webdriver.Remote:
+        from appium.options.ios import XCUITestOptions
+
         options = XCUITestOptions()
         options.udid = self.properties.device_udid
         options.platform_version = self.properties.platform_version
         options.bundle_id = self.properties.application_id
-        client_config = ClientConfig(remote_server_addr=self.properties.url)
-        appium_executor = AppiumConnection(client_config=client_config)
+        if self.properties.system_port:
+            options.wda_local_port = self.properties.system_port
         return appium_webdriver.Remote(
-            command_executor=appium_executor,
+            command_executor=_connection_for(self.properties.url),
             options=options
         )
 
 class RemoteBitBarWebDriver(WebDriver):
     """Class representing a remote BitBar web driver"""
     def get_driver(self) -> appium_webdriver.Remote:
+        from appium.options.android import UiAutomator2Options
+
         options = UiAutomator2Options()
         options.app_package = self.properties.application_id
         options.app_activity = self.properties.application_launch_activity
@@ -92,16 +103,16 @@ class RemoteBitBarWebDriver(WebDriver):
             'findDevice': False,
             'appiumVersion': '2.1'
         })
-        client_config = ClientConfig(remote_server_addr=self.properties.url)
-        appium_executor = AppiumConnection(client_config=client_config)
         return appium_webdriver.Remote(
-            command_executor=appium_executor,
+            command_executor=_connection_for(self.properties.url),
             options=options
         )
 
 class RemoteSauceWebDriver(WebDriver):
     """Class representing a remote Sauce web driver"""
     def get_driver(self) -> appium_webdriver.Remote:
+        from appium.options.ios import XCUITestOptions
+
         options = XCUITestOptions()
         options.device_name = self.properties.device_name
         options.platform_version = self.properties.platform_version
@@ -111,53 +122,32 @@ class RemoteSauceWebDriver(WebDriver):
             'username': self.properties.saucelabs_options.username,
             'accessKey': self.properties.saucelabs_options.access_key
         })
-        client_config = ClientConfig(remote_server_addr=self.properties.url)
-        appium_executor = AppiumConnection(client_config=client_config)
         return appium_webdriver.Remote(
-            command_executor=appium_executor,
+            command_executor=_connection_for(self.properties.url),
             options=options
         )
 
+_DRIVER_TABLE: dict[tuple[PlatformType, ProviderType], type[WebDriver]] = {
+    (PlatformType.ANDROID, ProviderType.LOCAL): LocalAndroidWebDriver,
+    (PlatformType.IOS, ProviderType.LOCAL): LocalIOSWebDriver,
+    (PlatformType.ANDROID, ProviderType.BITBAR): RemoteBitBarWebDriver,
+    (PlatformType.IOS, ProviderType.SAUCELABS): RemoteSauceWebDriver
+}
+
 class WebDriverFactory:
     """Class representing a web driver factory"""
     def __init__(self, execution_properties: ExecutionProperties):
         self.execution_properties = execution_properties
-        self.driver_classes = {}
-
-        self.register_driver(
-            ApplicationType.MOBILE_NATIVE,
-            PlatformType.ANDROID,
-            ProviderType.LOCAL,
-            LocalAndroidWebDriver
-        )
-        self.register_driver(
-            ApplicationType.MOBILE_NATIVE,
-            PlatformType.IOS,
-            ProviderType.LOCAL,
-            LocalIOSWebDriver
-        )
-        self.register_driver(
-            ApplicationType.MOBILE_NATIVE,
-            PlatformType.ANDROID,
-            ProviderType.BITBAR,
-            RemoteBitBarWebDriver
-        )
-        self.register_driver(
-            ApplicationType.MOBILE_NATIVE,
-            PlatformType.IOS,
-            ProviderType.SAUCELABS,
-            RemoteSauceWebDriver
-        )
+        self.driver_classes = dict(_DRIVER_TABLE)
 
     def register_driver(
         self,
-        app_type: ApplicationType,
-        driver_key: PlatformType,
+        platform: PlatformType,
         provider: ProviderType,
-        driver_class: WebDriver
+        driver_class: type[WebDriver]
     ):
-        """Registers a driver class for a given application type and driver key"""
-        self.driver_classes[(app_type, driver_key, provider)] = driver_class
+        """Registers a mobile native driver class for a given platform and provider"""
+        self.driver_classes[(platform, provider)] = driver_class
 
     def create_driver(
         self,
@@ -170,10 +160,7 @@ class WebDriverFactory:
         if app_type != ApplicationType.MOBILE_NATIVE:
             raise ValueError(f"Unsupported application type: {app_type}")
 
-        properties = cast(AppiumProperties, properties)
-        key = (app_type, properties.platform, provider)
-
-        driver_class = self.driver_classes.get(key)
+        driver_class = self.driver_classes.get((properties.platform, provider))
         if driver_class:
             return driver_class(properties).get_driver()
 
@@ -182,6 +169,106 @@ class WebDriverFactory:
 
         raise ValueError(f"Unsupported platform: {properties.platform}")
 
+class DriverSession:
+    """Class keeping one driver alive across tests and recreating it when the session dies"""
+    def __init__(
+        self,
+        factory: WebDriverFactory,
+        properties: AppiumProperties,
+        recycle_seconds: float = 86400.0
+    ):
+        self.validate_properties(properties)
+        self.factory = factory
+        self.properties = properties
+        self.recycle_seconds = recycle_seconds
+        self._driver = None
+        self._created_at = 0.0
+        self._pending: Future | None = None
+
+    @staticmethod
+    def validate_properties(properties: AppiumProperties):
+        """Rejects session options the target platform cannot honour"""
+        if properties.clear_app_state and properties.platform != PlatformType.ANDROID:
+            raise ValueError(
+                "clear_app_state is only supported on Android: Appium cannot clear the app "
+                f"data container on {properties.platform.value} devices"
+            )
+
+    @staticmethod
+    def _is_alive(driver: appium_webdriver.Remote) -> bool:
+        """Checks that the driver still has a session the server answers for"""
+        if not driver.session_id:
+            return False
+        try:
+            driver.current_context
+        except WebDriverException:
+            return False
+        return True
+
+    def prewarm(self):
+        """Starts creating the driver in a background thread"""
+        if self._driver is not None or self._pending is not None:
+            return
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='driver-prewarm')
+        self._pending = executor.submit(self.factory.create_driver, self.properties)
+        executor.shutdown(wait=False)
+
+    def _take_pending(self):
+        """Adopts the prewarmed driver, waiting for it if it is still being created"""
+        pending, self._pending = self._pending, None
+        self._driver = pending.result()
+        self._created_at = time.monotonic()
+
+    def get_driver(self) -> appium_webdriver.Remote:
+        """Returns the shared driver, creating a new session if the current one is gone"""
+        if self._pending is not None:
+            self._take_pending()
+        if (
+            self._driver is None or
+            time.monotonic() - self._created_at > self.recycle_seconds or
+            not self._is_alive(self._driver)
+        ):
+            self.quit()
+            self._driver = self.factory.create_driver(self.properties)
+            self._created_at = time.monotonic()
+        return self._driver
+
+    def reset_app(self):
+        """Restarts the application under test so the next test starts from a clean state"""
+        if self._driver is None or not self.properties.application_id:
+            return
+        app_id = self.properties.application_id
+        try:
+            self._driver.terminate_app(app_id)
+            if self.properties.clear_app_state:
+                self._clear_app_state(app_id)
+            self._driver.activate_app(app_id)
+        except WebDriverException:
+            self.quit()
+
+    def _clear_app_state(self, app_id: str):
+        """Clears the Android application data, keeping the session if clearing fails"""
+        try:
+            self._driver.execute_script('mobile: clearApp', {'appId': app_id})
+        except WebDriverException as exc:
+            warnings.warn(f"Could not clear the state of {app_id}: {exc.msg}", RuntimeWarning)
+
+    def quit(self):
+        """Quits the shared driver if one is running"""
+        if self._pending is not None:
+            try:
+                self._take_pending()
+            except Exception:
+                # The prewarmed session never came up, so there is nothing to quit
+                return
+        if self._driver is None:
+            return
+        try:
+            self._driver.quit()
+        except WebDriverException:
+            pass
+        self._driver = None
+
 class TestWebDriverFactory:
     """Test cases for WebDriverFactory class"""
     @pytest.fixture
@@ -210,3 +297,144 @@ class TestWebDriverFactory:
         with pytest.raises(ValueError) as exc_info:
             factory.create_driver(appium_props)
         assert "Unsupported application type" in str(exc_info.value)
+
+    def test_connection_reused_per_url(self):
+        """Test that Appium connections are shared for the same server URL"""
+        first = _connection_for("http://localhost:4723")
+
+        assert _connection_for("http://localhost:4723") is first
+        assert _connection_for("http://localhost:4724") is not first
+
+    def test_create_driver_registered_driver(self, setup):
+        """Test create_driver uses a registered driver class"""
+        factory, appium_props = setup
+        factory.execution_properties.application_type = ApplicationType.MOBILE_NATIVE
+        appium_props.platform = PlatformType.WINDOWS
+
+        class StubWebDriver(WebDriver):
+            """Stub driver returning a sentinel instead of a session"""
+            def get_driver(self):
+                return "stub-driver"
+
+        factory.register_driver(PlatformType.WINDOWS, ProviderType.LOCAL, StubWebDriver)
+
+        assert factory.create_driver(appium_props) == "stub-driver"
+        assert (PlatformType.WINDOWS, ProviderType.LOCAL) not in _DRIVER_TABLE
+
+class TestDriverSession:
+    """Test cases for DriverSession class"""
+    @pytest.fixture
+    def factory(self) -> Mock:
+        """Create a mock factory returning a new mock driver per call"""
+        factory = Mock(spec=WebDriverFactory)
+        factory.create_driver.side_effect = lambda _: Mock(session_id="session")
+        return factory
+
+    @pytest.fixture
+    def session(self, factory: Mock) -> DriverSession:
+        """Create a driver session for a test application"""
+        return DriverSession(factory, AppiumProperties(application_id="com.example.app"))
+
+    def test_driver_reused_while_alive(self, session: DriverSession, factory: Mock):
+        """Test that a live driver is shared between calls"""
+        driver = session.get_driver()
+
+        assert session.get_driver() is driver
+        factory.create_driver.assert_called_once()
+
+    def test_dead_driver_recreated(self, session: DriverSession, factory: Mock):
+        """Test that a driver whose session died is replaced"""
+        driver = session.get_driver()
+        type(driver).current_context = PropertyMock(side_effect=WebDriverException("session gone"))
+
+        assert session.get_driver() is not driver
+        driver.quit.assert_called_once()
+        assert factory.create_driver.call_count == 2
+
+    def test_old_driver_recycled(self, session: DriverSession, factory: Mock):
+        """Test that a driver older than the recycle age is replaced"""
+        driver = session.get_driver()
+        session.recycle_seconds = 0.0
+        session._created_at -= 1.0
+
+        assert session.get_driver() is not driver
+        driver.quit.assert_called_once()
+        assert factory.create_driver.call_count == 2
+
+    def test_prewarmed_driver_adopted(self, session: DriverSession, factory: Mock):
+        """Test that a prewarmed driver is handed to the first test"""
+        session.prewarm()
+        session.prewarm()
+        driver = session.get_driver()
+
+        assert session.get_driver() is driver
+        factory.create_driver.assert_called_once()
+
+    def test_prewarmed_driver_quit_unused(self, session: DriverSession):
+        """Test that a prewarmed driver is quit even if no test used it"""
+        session.prewarm()
+        pending = session._pending
+        session.quit()
+
+        pending.result().quit.assert_called_once()
+
+    def test_reset_app_restarts_application(self, session: DriverSession):
+        """Test that resetting terminates and activates the application"""
+        driver = session.get_driver()
+        session.reset_app()
+
+        driver.terminate_app.assert_called_once_with("com.example.app")
+        driver.activate_app.assert_called_once_with("com.example.app")
+
+    def test_reset_app_clears_app_state(self, factory: Mock):
+        """Test that app data is cleared between terminate and activate when enabled"""
+        properties = AppiumProperties(
+            platform=PlatformType.ANDROID,
+            application_id="com.example.app",
+            clear_app_state=True
+        )
+        session = DriverSession(factory, properties)
+        driver = session.get_driver()
+        session.reset_app()
+
+        assert [call[0] for call in driver.method_calls] == [
+            'terminate_app', 'execute_script', 'activate_app'
+        ]
+        driver.execute_script.assert_called_once_with(
+            'mobile: clearApp', {'appId': 'com.example.app'}
+        )
+
+    def test_clear_app_state_failure_keeps_driver(self, factory: Mock):
+        """Test that a failed state clear warns and keeps the session"""
+        properties = AppiumProperties(
+            platform=PlatformType.ANDROID,
+            application_id="com.example.app",
+            clear_app_state=True
+        )
+        session = DriverSession(factory, properties)
+        driver = session.get_driver()
+        driver.execute_script.side_effect = WebDriverException("clear failed")
+
+        with pytest.warns(RuntimeWarning, match="clear failed"):
+            session.reset_app()
+
+        driver.activate_app.assert_called_once_with("com.example.app")
+        driver.quit.assert_not_called()
+        assert session.get_driver() is driver
+
+    def test_clear_app_state_rejected_on_ios(self, factory: Mock):
+        """Test that clearing app state is rejected up front on iOS"""
+        properties = AppiumProperties(platform=PlatformType.IOS, clear_app_state=True)
+
+        with pytest.raises(ValueError, match="only supported on Android"):
+            DriverSession(factory, properties)
+        DriverSession(factory, AppiumProperties(platform=PlatformType.IOS))
+
+    def test_reset_app_failure_drops_driver(self, session: DriverSession, factory: Mock):
+        """Test that a failed reset forces a new session on the next test"""
+        driver = session.get_driver()
+        driver.terminate_app.side_effect = WebDriverException("crashed")
+        session.reset_app()
+
+        assert session.get_driver() is not driver
+        assert factory.create_driver.call_count == 2
@@ -6,6 +6,7 @@ The module handles:
 - Converting locator strings to Appium/Selenium locator tuples
 - Platform-specific locator management
 - Locator type enumeration and validation
+- Sharing one locator manager per platform across page objects
 
 Key features:
 - YAML-based locator storage
@@ -15,19 +16,29 @@ Key features:
 - Error handling for missing locators
 
 Usage:
-    manager = LocatorManager(PlatformType.ANDROID)
+    manager = get_locator_manager(PlatformType.ANDROID)
     locator = manager.get_locator("login_screen", "username_field")
 """
 
-import os
+import asyncio
 import unittest
 from enum import Enum
+from functools import lru_cache
+from pathlib import Path
 from unittest.mock import mock_open, patch
 
 import yaml
 from appium.webdriver.common.appiumby import AppiumBy
 
-from tests.conftest import PlatformType
+from lib.types import PlatformType
+
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+_FRAMEWORK_ROOT = Path(__file__).resolve().parent.parent
+_LOCATOR_FILE = {platform: f"locators_{platform.value.lower()}.yml" for platform in PlatformType}
 
 class LocatorType(Enum):
     """Enum for locator types"""
@@ -48,44 +59,64 @@ class LocatorType(Enum):
     IOS_PREDICATE = AppiumBy.IOS_PREDICATE
     CUSTOM = AppiumBy.CUSTOM
 
+_LOCATOR_BY_NAME = {
+    **{member.value.upper(): member.value for member in LocatorType},
+    **{member.name: member.value for member in LocatorType}
+}
+
+@lru_cache(maxsize=64)
+def _resolve_locator_type(locator_type: str) -> str:
+    """Resolves a locator type name or Appium strategy to the Appium strategy"""
+    return _LOCATOR_BY_NAME[locator_type.upper()]
+
 class LocatorManager:
     """Class to store and retrieve locators for different platforms"""
     def __init__(self, platform: PlatformType):
         self.platform = platform
+        self._all_locators = None
         self._locators_cache = {}
-        self._locators_file = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-            f"locators_{platform.value.lower()}.yml"
-        )
+        self._resolved_locators = {}
+        self._locators_file = _FRAMEWORK_ROOT / _LOCATOR_FILE[platform]
 
     def _load_locators(self) -> dict:
         """Loads locators from YAML file for the current platform"""
         try:
             with open(self._locators_file, encoding="utf-8") as f:
-                return yaml.safe_load(f)
+                return yaml.load(f, Loader=_Loader)
         except FileNotFoundError as exc:
             raise FileNotFoundError(
                 f"Locators file for {self.platform.value} not found."
             ) from exc
 
+    def _get_all_locators(self) -> dict:
+        """Loads the locators file once and returns its contents"""
+        if self._all_locators is None:
+            self._all_locators = self._load_locators()
+        return self._all_locators
+
+    async def load_async(self) -> dict:
+        """Load the locators file in a worker thread so other loads can overlap with it"""
+        return await asyncio.to_thread(self._get_all_locators)
+
     def get_locator(self, screen: str, element: str) -> tuple:
         """Gets a locator tuple (type, value) for a specific element on a screen"""
-        if screen not in self._locators_cache:
-            self._locators_cache[screen] = self._load_locators()
-
-        try:
-            locator_data = self._locators_cache[screen][element]
-            return (
-                LocatorType[locator_data["type"].upper()].value,
-                locator_data["value"]
-            )
-        except KeyError as exc:
-            raise KeyError(f"Element '{element}' not found in screen '{screen}'") from exc
+        locator = self._resolved_locators.get((screen, element))
+        if locator is None:
+            try:
+                locator_data = self.get_locators(screen)[element]
+                locator = (
+                    _resolve_locator_type(locator_data["type"]),
+                    locator_data["value"]
+                )
+            except KeyError as exc:
+                raise KeyError(f"Element '{element}' not found in screen '{screen}'") from exc
+            self._resolved_locators[(screen, element)] = locator
+        return locator
 
     def get_locators(self, screen: str) -> dict:
         """Gets all locators for a specific screen"""
         if screen not in self._locators_cache:
-            locators = self._load_locators()
+            locators = self._get_all_locators()
             if screen not in locators:
                 raise KeyError(f"Screen '{screen}' not found in locators")
             self._locators_cache[screen] = locators[screen]
@@ -94,6 +125,15 @@ class LocatorManager:
     def set_locators(self, screen: str, locators: dict):
         """Sets locators for a screen in the cache"""
         self._locators_cache[screen] = locators
+        self._resolved_locators = {
+            key: locator for key, locator in self._resolved_locators.items()
+            if key[0] != screen
+        }
+
+@lru_cache(maxsize=None)
+def get_locator_manager(platform: PlatformType) -> LocatorManager:
+    """Returns the locator manager shared by every page of a platform"""
+    return LocatorManager(platform)
 
 class TestPlatformLocatorManager(unittest.TestCase):
     """Test cases for PlatformLocatorManager class"""
@@ -126,6 +166,31 @@ class TestPlatformLocatorManager(unittest.TestCase):
         locator = self.manager.get_locator("login_screen", "username")
         self.assertEqual(locator, ("id", "username_field"))
 
+    def test_get_locator_strategy_type(self):
+        """Test getting a locator whose type is an Appium strategy string"""
+        self.manager.set_locators("login_screen", {
+            "login_button": {"type": "accessibility id", "value": "loginButton"},
+            "password_field": {"type": "-android uiautomator", "value": "new UiSelector()"}
+        })
+        self.assertEqual(
+            self.manager.get_locator("login_screen", "login_button"),
+            ("accessibility id", "loginButton")
+        )
+        self.assertEqual(
+            self.manager.get_locator("login_screen", "password_field"),
+            ("-android uiautomator", "new UiSelector()")
+        )
+
+    def test_get_locator_after_set_locators(self):
+        """Test that replacing a screen's locators invalidates resolved locators"""
+        self.manager.set_locators("login_screen", self.test_locators["login_screen"])
+        self.manager.get_locator("login_screen", "username")
+        self.manager.set_locators("login_screen", {
+            "username": {"type": "name", "value": "username"}
+        })
+        locator = self.manager.get_locator("login_screen", "username")
+        self.assertEqual(locator, ("name", "username"))
+
     def test_get_locator_invalid_screen(self):
         """Test getting a locator for invalid screen"""
         with self.assertRaises(KeyError):
@@ -169,6 +234,40 @@ class TestPlatformLocatorManager(unittest.TestCase):
         self.assertEqual(locators["login_screen"]["username"]["type"], "id")
         self.assertEqual(locators["login_screen"]["username"]["value"], "test")
 
+    def test_locators_file_loaded_once(self):
+        """Test that the locators file is read once for multiple screens"""
+        with patch.object(
+            self.TestablePlatformLocatorManager,
+            '_load_locators',
+            return_value=self.test_locators | {"home_screen": {}}
+        ) as load:
+            self.manager.get_locator("login_screen", "username")
+            self.manager.get_locators("home_screen")
+            self.manager.get_locator("login_screen", "password")
+
+        load.assert_called_once()
+
+    def test_load_async(self):
+        """Test loading locators asynchronously"""
+        with patch.object(
+            self.TestablePlatformLocatorManager,
+            '_load_locators',
+            return_value=self.test_locators
+        ) as load:
+            locators = asyncio.run(self.manager.load_async())
+            locator = self.manager.get_locator("login_screen", "username")
+
+        self.assertEqual(locator, ("id", "username_field"))
+        self.assertEqual(locators, self.test_locators)
+        load.assert_called_once()
+
+    def test_get_locator_manager_shared_per_platform(self):
+        """Test that one locator manager is shared per platform"""
+        manager = get_locator_manager(PlatformType.ANDROID)
+
+        self.assertIs(get_locator_manager(PlatformType.ANDROID), manager)
+        self.assertIsNot(get_locator_manager(PlatformType.IOS), manager)
+
     @patch('builtins.open', side_effect=FileNotFoundError)
     def test_load_locators_file_not_found(self, _):
         """Test loading locators when file not found"""
@@ -4,18 +4,27 @@ This module defines the core data models used throughout the test automation fra
 from dataclasses import dataclass, field
 from typing import NamedTuple
 
-from lib.types import ApplicationType, PlatformType, ProviderType
+from lib.types import (
+    ApplicationType,
+    ExecutionMode,
+    PlatformType,
+    ProviderType,
+    RecordMode
+)
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionProperties:
     """A dataclass that holds various configuration properties for tests"""
     application_type: ApplicationType = ApplicationType.WEB
     provider: ProviderType = ProviderType.LOCAL
+    mode: ExecutionMode = ExecutionMode.LIVE
     log_level: str = 'INFO'
+    record_mode: RecordMode = RecordMode.ALWAYS
+    cached_artifacts: bool = False
     test_grep: str = ''
     test_spec: str = ''
 
-@dataclass
+@dataclass(slots=True)
 class FrameworkProperties:
     """A dataclass that holds various configuration properties for tests"""
     encryption_key: str = 'm8e0EMDdBnV0I6SGz-H7v1CKgQhLSnNcEIS5K4-WD1o='
@@ -24,15 +33,18 @@ class FrameworkProperties:
     time_implicit_wait: float = 10.0
     time_timeout: float = 10.0
     time_interval: float = 0.5
+    time_presence_timeout: float = 0.5
+    time_presence_interval: float = 0.1
+    time_session_recycle: float = 86400.0
 
-@dataclass
+@dataclass(slots=True)
 class WebDriverProperties:
     """A dataclass that holds various configuration properties for tests"""
     platform: PlatformType = PlatformType.WINDOWS
     platform_version: str = ''
     url: str = 'http://localhost:4723'
 
-@dataclass
+@dataclass(slots=True)
 class BitbarOptions:
     """A dataclass that holds various configuration properties for tests"""
     api_key: str = ''
@@ -40,20 +52,23 @@ class BitbarOptions:
     project: str = ''
     testrun: str = ''
 
-@dataclass
+@dataclass(slots=True)
 class SauceLabsOptions:
     """A dataclass that holds various configuration properties for tests"""
     name: str = ''
     username: str = ''
     access_key: str = ''
 
-@dataclass
+@dataclass(slots=True)
 class AppiumProperties(WebDriverProperties):
     """A dataclass that holds various configuration properties for tests"""
     application_id: str = ''
     application_launch_activity: str = ''
     device_udid: str = ''
+    device_udid_pool: str = ''
     device_name: str = ''
+    system_port: int = 0
+    clear_app_state: bool = False
     bitbar_options: BitbarOptions = field(default_factory=BitbarOptions)
     saucelabs_options: SauceLabsOptions = field(default_factory=SauceLabsOptions)
 
@@ -5,12 +5,14 @@ The module contains enums for:
 - ApplicationType: Defines the type of application being tested (web, mobile native, mobile web)
 - PlatformType: Defines the platform/OS being tested on (Android, iOS, Linux, Mac, Windows) 
 - ProviderType: Defines the test execution provider (Bitbar, Local, Saucelabs)
+- RecordMode: Defines when screen recordings are captured (always, on failure, never)
+- ExecutionMode: Defines the backend tests run against (live, record, playback)
 
 These enums are used for configuration and to control test execution behavior based on
 the target environment and application type.
 
 Usage:
-    from lib.types import ApplicationType, PlatformType, ProviderType
+    from lib.types import ApplicationType, ExecutionMode, PlatformType, ProviderType, RecordMode
     
     app_type = ApplicationType.WEB
     platform = PlatformType.ANDROID
@@ -18,6 +20,8 @@ Usage:
 """
 from enum import Enum
 
+__all__ = ['ApplicationType', 'ExecutionMode', 'PlatformType', 'ProviderType', 'RecordMode']
+
 class ApplicationType(Enum):
     """Enum for application types"""
     WEB = 'web'
@@ -37,3 +41,15 @@ class ProviderType(Enum):
     BITBAR = 'bitbar'
     LOCAL = 'local'
     SAUCELABS = 'saucelabs'
+
+class RecordMode(Enum):
+    """Enum for screen recording modes"""
+    ALWAYS = 'always'
+    ON_FAILURE = 'on-failure'
+    NEVER = 'never'
+
+class ExecutionMode(Enum):
+    """Enum for execution modes"""
+    LIVE = 'live'
+    RECORD = 'record'
+    PLAYBACK = 'playback'
@@ -5,115 +5,407 @@ The Attachments class handles:
 - Capturing and saving screenshots during test execution
 - Recording and saving screen recordings for Android and iOS
 - Collecting and saving device logs (logcat for Android, system logs for iOS)
-- Attaching all captured artifacts to Allure test reports
+- Attaching all captured artifacts of a test to Allure reports in a single pass
+- Caching the artifacts of passing tests so unchanged tests can attach them again
 
 Key features:
 - Platform-specific handling for Android and iOS
-- Automatic file naming with timestamps
+- Artifacts decoded and written in worker threads while the next one is fetched
+- Automatic file naming with timestamps, unique per test and pytest-xdist worker
 - Integration with Allure reporting framework
 - Support for screenshots, recordings and logs
 """
-import base64
+import itertools
 import os
-from datetime import datetime
+import shutil
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
 from typing import Callable
+from unittest.mock import Mock, patch
 
 import allure
+import pytest
 from appium import webdriver
 
 from lib.models import FrameworkProperties, PlatformType
+from lib.utils.paths import PROJECT_ROOT, ensure_dir, run_timestamp
+
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+_RUN_TIMESTAMP = run_timestamp()
+_instance_ids = itertools.count(1)
 
 class Attachments:
     """Class for attaching files to Allure reports"""
     TEXT_EXT = 'txt'
     MP4_EXT = 'mp4'
     PNG_EXT = 'png'
+    LOG_BUFFER_SIZE = 1 << 20
+    SMALL_FILE_SIZE = 4096
+    ATTACHMENT_TYPES = {
+        TEXT_EXT: allure.attachment_type.TEXT,
+        MP4_EXT: allure.attachment_type.MP4,
+        PNG_EXT: allure.attachment_type.PNG
+    }
+    _executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='attachments')
 
-    def __init__(self, driver: webdriver.Remote, framework_properties: FrameworkProperties):
+    def __init__(
+        self,
+        driver: webdriver.Remote,
+        framework_properties: FrameworkProperties,
+        platform: PlatformType
+    ):
         self.driver = driver
         self.framework_properties = framework_properties
-        self.timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+        self.platform = platform
+        self.timestamp = self._next_timestamp()
         self.attachments_dir = os.path.join(
-            os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")),
+            PROJECT_ROOT,
             self.framework_properties.path_attachments_dir
         )
-        os.makedirs(self.attachments_dir, exist_ok=True)
-
-        self._log_handlers = {
-            PlatformType.ANDROID: lambda: self._save_logs('logcat'),
-            PlatformType.IOS: lambda: self._save_logs('syslog')
-        }
-
-        self._recording_handlers = {
-            PlatformType.ANDROID:
-                lambda: self._save_recording('mobile: stopMediaProjectionRecording'),
-            PlatformType.IOS:
-                lambda: self._save_file(
-                    base64.b64decode(self.driver.stop_recording_screen()),
-                    'recording',
-                    self.MP4_EXT
-                )
-        }
+        ensure_dir(self.attachments_dir)
+
+        if platform == PlatformType.ANDROID:
+            self._save_platform_logs = partial(self._save_logs, 'logcat')
+            self._save_platform_recording = self._save_android_recording
+        elif platform == PlatformType.IOS:
+            self._save_platform_logs = partial(self._save_logs, 'syslog')
+            self._save_platform_recording = self._save_ios_recording
+        else:
+            self._save_platform_logs = self._save_platform_recording = self._unsupported_platform
+
+    @staticmethod
+    def _next_timestamp() -> str:
+        """Build a file name timestamp unique to this run and test"""
+        return f"{_RUN_TIMESTAMP}-{next(_instance_ids)}"
+
+    def reset_per_test(self, driver: webdriver.Remote):
+        """Bind the driver of the next test and give its artifacts new file names"""
+        self.driver = driver
+        self.timestamp = self._next_timestamp()
+
+    def _file_path(self, file_type: str, extension: str) -> str:
+        """Build the path of an artifact file"""
+        return os.path.join(self.attachments_dir, f"{file_type}-{self.timestamp}.{extension}")
 
     def _save_file(self, content: bytes, file_type: str, extension: str) -> str:
         """Generic method to save file content"""
-        filename = os.path.join(self.attachments_dir, f"{file_type}-{self.timestamp}.{extension}")
-        with open(filename, 'wb') as f:
-            f.write(content)
+        filename = self._file_path(file_type, extension)
+        if len(content) < self.SMALL_FILE_SIZE:
+            self._save_small(filename, content)
+        else:
+            with open(filename, 'wb') as f:
+                f.write(content)
         return filename
 
-    def _save_logs(self, log_type: str) -> str:
-        """Save logs to a file"""
-        logs = self.driver.get_log(log_type)
-        content = "\n".join(f"{log['timestamp']} {log['message']}" for log in logs)
-        return self._save_file(content.encode('utf-8'), log_type, self.TEXT_EXT)
+    def _save_small(self, filename: str, content: bytes):
+        """Write small content with a single raw write, bypassing buffered I/O"""
+        fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, content)
+        finally:
+            os.close(fd)
+
+    def _save_logs(self, log_type: str) -> Future:
+        """Fetch device logs and stream them to a file in a worker thread"""
+        return self._executor.submit(self._write_logs, self.driver.get_log(log_type), log_type)
+
+    def _write_logs(self, logs: list[dict], log_type: str) -> str:
+        """Stream logs to a file one entry at a time"""
+        filename = self._file_path(log_type, self.TEXT_EXT)
+        with open(filename, 'wb', buffering=self.LOG_BUFFER_SIZE) as f:
+            for log in logs:
+                f.write(f"{log['timestamp']} {log['message']}\n".encode('utf-8'))
+        return filename
+
+    def _save_recording(self, recording: str) -> Future:
+        """Decode and save the base64 screen recording to a file in a worker thread"""
+        return self._executor.submit(
+            lambda: self._save_file(base64.b64decode(recording), 'recording', self.MP4_EXT)
+        )
+
+    def _save_android_recording(self) -> Future:
+        """Stop the Android media projection recording and save it"""
+        return self._save_recording(
+            self.driver.execute_script('mobile: stopMediaProjectionRecording')
+        )
+
+    def _save_ios_recording(self) -> Future:
+        """Stop the iOS screen recording and save it"""
+        return self._save_recording(self.driver.stop_recording_screen())
 
-    def _save_recording(self, command: str) -> str:
-        """Save the screen recording to a file"""
-        recording = self.driver.execute_script(command)
-        return self._save_file(base64.b64decode(recording), 'recording', self.MP4_EXT)
+    def discard_recording(self):
+        """Stop the running screen recording without decoding or saving it"""
+        if self.platform == PlatformType.ANDROID:
+            self.driver.execute_script('mobile: stopMediaProjectionRecording')
+        elif self.platform == PlatformType.IOS:
+            self.driver.stop_recording_screen()
+
+    def _unsupported_platform(self):
+        """Reject logs and recordings for platforms without device artifacts"""
+        raise ValueError(f"Unsupported platform for device artifacts: {self.platform}")
+
+    def _save_screenshot(self) -> Future:
+        """Take a screenshot and decode and save it to a file in a worker thread"""
+        screenshot = self.driver.get_screenshot_as_base64()
+        return self._executor.submit(
+            lambda: self._save_file(base64.b64decode(screenshot), 'screenshot', self.PNG_EXT)
+        )
+
+    def _save_session_id(self) -> str:
+        """Save the WebDriver session ID to a file"""
+        return self._save_file(self.driver.session_id.encode('utf-8'), 'session_id', self.TEXT_EXT)
 
     def _attach_file(self, save_func: Callable, name: str, attachment_type: allure.attachment_type):
         """Generic method to attach file to Allure report"""
         filename = save_func()
+        if isinstance(filename, Future):
+            filename = filename.result()
         allure.attach.file(filename, name=name, attachment_type=attachment_type)
 
-    def attach_logs(self, platform: PlatformType):
+    def attach_logs(self):
         """Attach logs to the Allure report"""
         self._attach_file(
-            self._log_handlers[platform],
+            self._save_platform_logs,
             'logs',
             allure.attachment_type.TEXT
         )
 
-    def attach_recording(self, platform: PlatformType):
+    def attach_recording(self):
         """Attach the recording to the Allure report"""
         self._attach_file(
-            self._recording_handlers[platform],
+            self._save_platform_recording,
             'recording',
             allure.attachment_type.MP4
         )
 
     def attach_screenshot(self):
         """Attach the screenshot to the Allure report"""
-        self._attach_file(
-            lambda: self._save_file(
-                self.driver.get_screenshot_as_png(),
-                'screenshot',
-                self.PNG_EXT
-            ),
-            'screenshot',
-            allure.attachment_type.PNG
-        )
+        self._attach_file(self._save_screenshot, 'screenshot', allure.attachment_type.PNG)
 
     def attach_session_id(self):
         """Attach the WebDriver session ID to the Allure report"""
-        self._attach_file(
-            lambda: self._save_file(
-                self.driver.session_id.encode('utf-8'),
-                'session_id',
-                self.TEXT_EXT
-            ),
-            'session_id',
-            allure.attachment_type.TEXT
-        )
+        self._attach_file(self._save_session_id, 'session_id', allure.attachment_type.TEXT)
+
+    def attach_all(
+        self,
+        include_recording: bool = True,
+        include_screenshot: bool = False
+    ) -> list[tuple[str, str, str]]:
+        """Fetch all artifacts, write them in worker threads, then attach them in one pass"""
+        recording = self._save_platform_recording() if include_recording else None
+
+        saved = [
+            (self._save_platform_logs(), 'logs', allure.attachment_type.TEXT),
+            (self._save_session_id(), 'session_id', allure.attachment_type.TEXT)
+        ]
+        if recording is not None:
+            saved.append((recording, 'recording', allure.attachment_type.MP4))
+        if include_screenshot:
+            saved.append((self._save_screenshot(), 'screenshot', allure.attachment_type.PNG))
+
+        saved = [
+            (filename.result() if isinstance(filename, Future) else filename, name, attachment_type)
+            for filename, name, attachment_type in saved
+        ]
+        # Allure records attachments against the running test, so attach on this thread
+        for filename, name, attachment_type in saved:
+            allure.attach.file(filename, name=name, attachment_type=attachment_type)
+        return saved
+
+    def store_cached(self, saved: list[tuple[str, str, str]], cache_dir: Path):
+        """Copy attached artifacts into a cache directory, replacing what it held before"""
+        # Leftovers of an earlier run would otherwise be attached again alongside these
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        cache_dir.mkdir(parents=True)
+        for index, (filename, name, _) in enumerate(saved):
+            extension = os.path.splitext(filename)[1]
+            shutil.copyfile(filename, cache_dir / f"{index}-{name}{extension}")
+
+    def attach_cached(self, cache_dir: Path):
+        """Attach artifacts previously stored with store_cached"""
+        cached = sorted(cache_dir.iterdir(), key=lambda path: int(path.stem.split('-', 1)[0]))
+        for path in cached:
+            allure.attach.file(
+                str(path),
+                name=path.stem.split('-', 1)[1],
+                attachment_type=self.ATTACHMENT_TYPES[path.suffix[1:]]
+            )
+
+class TestAttachments:
+    """Test suite for Attachments class"""
+
+    class TestableAttachments(Attachments):
+        """Subclass to expose protected methods for testing"""
+        __test__ = False
+
+        def save_file(self, content: bytes, file_type: str, extension: str) -> str:
+            """Expose protected method for testing"""
+            return self._save_file(content, file_type, extension)
+
+    @pytest.fixture
+    def driver(self) -> Mock:
+        """Create a mock driver returning canned artifacts"""
+        driver = Mock()
+        driver.session_id = 'session-123'
+        driver.get_log.return_value = [
+            {'timestamp': 1, 'message': 'first'},
+            {'timestamp': 2, 'message': 'second'}
+        ]
+        driver.execute_script.return_value = base64.b64encode(b'android-video').decode()
+        driver.stop_recording_screen.return_value = base64.b64encode(b'ios-video').decode()
+        driver.get_screenshot_as_base64.return_value = base64.b64encode(b'png-bytes').decode()
+        return driver
+
+    @pytest.fixture
+    def framework_properties(self, tmp_path) -> FrameworkProperties:
+        """Create framework properties writing to a temporary directory"""
+        return FrameworkProperties(path_attachments_dir=str(tmp_path))
+
+    @pytest.fixture
+    def attachments(self, driver: Mock, framework_properties: FrameworkProperties) -> Attachments:
+        """Create an Android Attachments instance writing to a temporary directory"""
+        return self.TestableAttachments(driver, framework_properties, PlatformType.ANDROID)
+
+    @staticmethod
+    def read(filename: str) -> bytes:
+        """Read a saved artifact"""
+        with open(filename, 'rb') as f:
+            return f.read()
+
+    def test_attach_all(self, attachments: Attachments):
+        """Test that all artifacts are saved and attached in order"""
+        with patch.object(allure.attach, 'file') as attach_file:
+            attachments.attach_all(include_screenshot=True)
+
+        calls = attach_file.call_args_list
+        assert [call.kwargs['name'] for call in calls] == [
+            'logs', 'session_id', 'recording', 'screenshot'
+        ]
+        files = [self.read(call.args[0]) for call in calls]
+        assert files == [b'1 first\n2 second\n', b'session-123', b'android-video', b'png-bytes']
+
+    def test_attach_all_fetches_recording_first(
+        self,
+        driver: Mock,
+        framework_properties: FrameworkProperties
+    ):
+        """Test that the recording is fetched before logs so decoding overlaps with them"""
+        attachments = Attachments(driver, framework_properties, PlatformType.IOS)
+        with patch.object(allure.attach, 'file'):
+            attachments.attach_all()
+
+        assert [call[0] for call in driver.method_calls] == ['stop_recording_screen', 'get_log']
+
+    def test_attach_recording(self, attachments: Attachments):
+        """Test that a single recording attachment waits for the decoded file"""
+        with patch.object(allure.attach, 'file') as attach_file:
+            attachments.attach_recording()
+
+        assert self.read(attach_file.call_args.args[0]) == b'android-video'
+
+    def test_attach_all_without_recording(
+        self,
+        driver: Mock,
+        framework_properties: FrameworkProperties
+    ):
+        """Test that the recording can be skipped"""
+        attachments = Attachments(driver, framework_properties, PlatformType.IOS)
+        with patch.object(allure.attach, 'file') as attach_file:
+            attachments.attach_all(include_recording=False)
+
+        assert [call.kwargs['name'] for call in attach_file.call_args_list] == [
+            'logs', 'session_id'
+        ]
+        driver.get_log.assert_called_once_with('syslog')
+        driver.stop_recording_screen.assert_not_called()
+
+    def test_cached_artifacts_attached_in_order(self, attachments: Attachments, tmp_path):
+        """Test that cached artifacts are attached again with their names, types and order"""
+        cache_dir = tmp_path / 'cache'
+        with patch.object(allure.attach, 'file') as attach_file:
+            attachments.store_cached(attachments.attach_all(include_screenshot=True), cache_dir)
+            attach_file.reset_mock()
+            attachments.attach_cached(cache_dir)
+
+        calls = attach_file.call_args_list
+        assert [call.kwargs['name'] for call in calls] == [
+            'logs', 'session_id', 'recording', 'screenshot'
+        ]
+        assert calls[-1].kwargs['attachment_type'] == allure.attachment_type.PNG
+        assert self.read(calls[1].args[0]) == b'session-123'
+
+    def test_store_cached_replaces_previous_artifacts(self, attachments: Attachments, tmp_path):
+        """Test that storing artifacts again drops the ones cached by an earlier run"""
+        cache_dir = tmp_path / 'cache'
+        with patch.object(allure.attach, 'file') as attach_file:
+            attachments.store_cached(attachments.attach_all(include_screenshot=True), cache_dir)
+            attachments.store_cached(attachments.attach_all(include_recording=False), cache_dir)
+            attach_file.reset_mock()
+            attachments.attach_cached(cache_dir)
+
+        assert [call.kwargs['name'] for call in attach_file.call_args_list] == [
+            'logs', 'session_id'
+        ]
+
+    def test_discard_recording(self, attachments: Attachments, driver: Mock):
+        """Test that discarding stops the recording without saving a file"""
+        with patch.object(Attachments, '_save_recording') as save_recording:
+            attachments.discard_recording()
+
+        driver.execute_script.assert_called_with('mobile: stopMediaProjectionRecording')
+        save_recording.assert_not_called()
+
+    def test_save_file_small_and_large(self, attachments: TestableAttachments):
+        """Test that small and large files are saved completely"""
+        small = b'x' * (Attachments.SMALL_FILE_SIZE - 1)
+        large = b'y' * (Attachments.SMALL_FILE_SIZE * 4)
+
+        assert self.read(attachments.save_file(small, 'small', Attachments.TEXT_EXT)) == small
+        assert self.read(attachments.save_file(large, 'large', Attachments.TEXT_EXT)) == large
+
+    def test_unsupported_platform(self, driver: Mock, framework_properties: FrameworkProperties):
+        """Test that device artifacts are rejected for platforms without them"""
+        attachments = Attachments(driver, framework_properties, PlatformType.WINDOWS)
+        with pytest.raises(ValueError, match="Unsupported platform"):
+            attachments.attach_logs()
+
+    def test_reset_per_test(self, attachments: Attachments, driver: Mock):
+        """Test that a reused instance gets the new driver and new file names"""
+        previous = attachments.timestamp
+        new_driver = Mock(session_id='session-456')
+        attachments.reset_per_test(new_driver)
+
+        with patch.object(allure.attach, 'file') as attach_file:
+            attachments.attach_session_id()
+
+        assert attachments.timestamp != previous
+        assert self.read(attach_file.call_args.args[0]) == b'session-456'
+
+    def test_instances_use_distinct_file_names(
+        self,
+        driver: Mock,
+        framework_properties: FrameworkProperties
+    ):
+        """Test that artifacts of different instances do not overwrite each other"""
+        first = Attachments(driver, framework_properties, PlatformType.ANDROID)
+        second = Attachments(driver, framework_properties, PlatformType.ANDROID)
+
+        assert first.timestamp.startswith(_RUN_TIMESTAMP)
+        assert first.timestamp != second.timestamp
+
+    def test_workers_use_distinct_file_names(self, monkeypatch: pytest.MonkeyPatch):
+        """Test that xdist workers started in the same second name their artifacts apart"""
+        monkeypatch.setenv('PYTEST_XDIST_WORKER', 'gw0')
+        first = run_timestamp()
+        monkeypatch.setenv('PYTEST_XDIST_WORKER', 'gw1')
+        second = run_timestamp()
+        monkeypatch.delenv('PYTEST_XDIST_WORKER')
+
+        assert first.endswith('-gw0')
+        assert second.endswith('-gw1')
+        assert not run_timestamp().endswith(('-gw0', '-gw1'))
@@ -4,20 +4,66 @@ This module provides encryption and decryption functionality for secure data han
 The SecretManager class handles:
 - Encrypting strings using Fernet symmetric encryption
 - Decrypting previously encrypted strings
-- Base64 encoding/decoding of encrypted data
+- Base64 encoding/decoding of encrypted data, including legacy double-encoded tokens
+- Batch and compact AES-GCM bulk encryption of many values at once
 
 Key features:
-- Secure encryption using the cryptography.fernet module
-- String-based input/output with automatic encoding handling
-- Base64 encoding for safe storage and transmission
+- Secure encryption using the cryptography.fernet module, or rfernet when installed
+- String and bytes input/output with automatic encoding handling
+- URL-safe base64 Fernet tokens for safe storage and transmission
 - Simple API for encryption and decryption operations
 """
-import base64
+import binascii
+import hmac
+import os
+import time
+from functools import cached_property
+from hashlib import sha256
+from types import SimpleNamespace
+
 import pytest
+from cryptography.exceptions import InvalidTag
 from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes, padding
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+try:
+    import rfernet
+except ImportError:
+    rfernet = None
+
+class _RFernetAdapter:
+    """Adapter exposing rfernet through the cryptography Fernet interface"""
+
+    def __init__(self, key: str):
+        self._fernet = rfernet.Fernet(key if isinstance(key, str) else key.decode())
+
+    def encrypt(self, data: bytes) -> bytes:
+        """Encrypt bytes and return the Fernet token"""
+        return self._fernet.encrypt(data).encode()
+
+    def decrypt(self, token: bytes) -> bytes:
+        """Decrypt a Fernet token, raising InvalidToken on failure"""
+        try:
+            return self._fernet.decrypt(token.decode())
+        except (rfernet.DecryptionError, UnicodeDecodeError) as exc:
+            raise InvalidToken from exc
 
 class SecretManager:
     """Class to encrypt and decrypt strings"""
+    FERNET_VERSION = 0x80
+    HMAC_SIZE = 32
+    MIN_TOKEN_SIZE = 73
+    LEGACY_TOKEN_PREFIX = b'Z0FBQUFB'
+    BULK_NONCE_SIZE = 12
+    BULK_KEY_INFO = b'SecretManager bulk AES-GCM'
 
     @staticmethod
     def generate_key() -> str:
@@ -25,20 +71,146 @@ class SecretManager:
         return Fernet.generate_key().decode()
 
     def __init__(self, key: str):
-        self.fernet = Fernet(key)
+        self.fernet = _RFernetAdapter(key) if rfernet else Fernet(key)
+        raw_key = base64.urlsafe_b64decode(key)
+        self._raw_key = raw_key
+        self._signing_key = raw_key[:16]
+        self._encryption_key = raw_key[16:]
 
     def encrypt(self, data: str) -> str:
-        """Encrypt a string and return base64 encoded string"""
-        return base64.b64encode(
-            self.fernet.encrypt(data.encode())
-        ).decode()
+        """Encrypt a string and return the Fernet token"""
+        return self.encrypt_bytes(data.encode()).decode('ascii')
 
     def decrypt(self, encrypted_data: str) -> str:
-        """Decrypt a base64 encoded encrypted string"""
-        return self.fernet.decrypt(
-            base64.b64decode(encrypted_data.encode())
+        """Decrypt a Fernet token"""
+        return self.decrypt_bytes(self._encode_token(encrypted_data)).decode()
+
+    def encrypt_bytes(self, data: bytes) -> bytes:
+        """Encrypt bytes and return the Fernet token as bytes"""
+        return self.fernet.encrypt(data)
+
+    def decrypt_bytes(self, encrypted_data: bytes) -> bytes:
+        """Decrypt a Fernet token given as bytes"""
+        return self.fernet.decrypt(self._to_token(encrypted_data))
+
+    def encrypt_many(self, data: list[str]) -> list[str]:
+        """Encrypt a batch of strings and return their Fernet tokens"""
+        if isinstance(self.fernet, _RFernetAdapter):
+            return [self.encrypt(item) for item in data]
+        signer = hmac.new(self._signing_key, digestmod=sha256)
+        algorithm = algorithms.AES(self._encryption_key)
+        timestamp = int(time.time()).to_bytes(8, 'big')
+        return [
+            self._encrypt_token(item.encode(), timestamp, signer, algorithm).decode('ascii')
+            for item in data
+        ]
+
+    def decrypt_many(self, encrypted_data: list[str]) -> list[str]:
+        """Decrypt a batch of Fernet tokens"""
+        if isinstance(self.fernet, _RFernetAdapter):
+            return [self.decrypt(item) for item in encrypted_data]
+        signer = hmac.new(self._signing_key, digestmod=sha256)
+        algorithm = algorithms.AES(self._encryption_key)
+        return [
+            self._decrypt_token(
+                self._to_token(self._encode_token(item)), signer, algorithm
+            ).decode()
+            for item in encrypted_data
+        ]
+
+    def encrypt_bulk(self, items: list[bytes]) -> list[bytes]:
+        """Encrypt a batch of byte strings with AES-GCM and return nonce-prefixed ciphertexts"""
+        nonces = os.urandom(self.BULK_NONCE_SIZE * len(items))
+        cipher = self._bulk_cipher
+        result = []
+        for index, item in enumerate(items):
+            nonce = nonces[index * self.BULK_NONCE_SIZE:(index + 1) * self.BULK_NONCE_SIZE]
+            result.append(nonce + cipher.encrypt(nonce, item, None))
+        return result
+
+    def decrypt_bulk(self, items: list[bytes]) -> list[bytes]:
+        """Decrypt a batch of ciphertexts produced by encrypt_bulk"""
+        cipher = self._bulk_cipher
+        try:
+            return [
+                cipher.decrypt(item[:self.BULK_NONCE_SIZE], item[self.BULK_NONCE_SIZE:], None)
+                for item in items
+            ]
+        except (InvalidTag, ValueError) as exc:
+            raise InvalidToken from exc
+
+    @cached_property
+    def _bulk_cipher(self) -> AESGCM:
+        """AES-GCM cipher keyed separately from the Fernet keys via HKDF"""
+        bulk_key = HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=None,
+            info=self.BULK_KEY_INFO
+        ).derive(self._raw_key)
+        return AESGCM(bulk_key)
+
+    @staticmethod
+    def _encode_token(encrypted_data: str) -> bytes:
+        """Encode a token string, rejecting characters no Fernet token contains"""
+        try:
+            return encrypted_data.encode('ascii')
+        except UnicodeEncodeError as exc:
+            raise InvalidToken from exc
+
+    def _to_token(self, encrypted_data: bytes) -> bytes:
+        """Convert encrypted data to a Fernet token, unwrapping legacy encoding"""
+        if encrypted_data.startswith(self.LEGACY_TOKEN_PREFIX):
+            return base64.b64decode(encrypted_data)
+        return encrypted_data
 
-        ).decode()
+    def _encrypt_token(
+        self,
+        data: bytes,
+        timestamp: bytes,
+        signer: hmac.HMAC,
+        algorithm: algorithms.AES
+    ) -> bytes:
+        """Encrypt and sign a single Fernet token using prepared key material"""
+        iv = os.urandom(16)
+        padder = padding.PKCS7(algorithms.AES.block_size).padder()
+        encryptor = Cipher(algorithm, modes.CBC(iv)).encryptor()
+        ciphertext = encryptor.update(padder.update(data) + padder.finalize())
+        payload = (
+            bytes([self.FERNET_VERSION]) + timestamp + iv
+            + ciphertext + encryptor.finalize()
+        )
+        mac = signer.copy()
+        mac.update(payload)
+        return base64.urlsafe_b64encode(payload + mac.digest())
+
+    def _decrypt_token(
+        self,
+        token: bytes,
+        signer: hmac.HMAC,
+        algorithm: algorithms.AES
+    ) -> bytes:
+        """Verify and decrypt a single Fernet token using prepared key material"""
+        try:
+            data = base64.urlsafe_b64decode(token)
+        except (TypeError, binascii.Error) as exc:
+            raise InvalidToken from exc
+
+        if len(data) < self.MIN_TOKEN_SIZE or data[0] != self.FERNET_VERSION:
+            raise InvalidToken
+
+        mac = signer.copy()
+        mac.update(data[:-self.HMAC_SIZE])
+        if not hmac.compare_digest(mac.digest(), data[-self.HMAC_SIZE:]):
+            raise InvalidToken
+
+        decryptor = Cipher(algorithm, modes.CBC(data[9:25])).decryptor()
+        unpadder = padding.PKCS7(algorithms.AES.block_size).unpadder()
+        try:
+            padded = decryptor.update(data[25:-self.HMAC_SIZE]) + decryptor.finalize()
+            return unpadder.update(padded) + unpadder.finalize()
+        except ValueError as exc:
+            raise InvalidToken from exc
 
 class TestSecretManager:
     """Test suite for SecretManager class"""
@@ -95,6 +267,13 @@ class TestSecretManager:
         with pytest.raises(Exception):
             secret_manager.decrypt("invalid-data")
 
+    def test_non_ascii_token_raises_invalid_token(self, secret_manager):
+        """Test that tokens with non-ASCII characters are rejected as invalid"""
+        with pytest.raises(InvalidToken):
+            secret_manager.decrypt("gAAAAé")
+        with pytest.raises(InvalidToken):
+            secret_manager.decrypt_many([secret_manager.encrypt("Test message"), "gAAAAé"])
+
     def test_special_characters(self, secret_manager):
         """Test encryption/decryption of special characters"""
         special_text = "!@#$%^&*()_+-=[]{}|;:,.<>?"
@@ -102,3 +281,162 @@ class TestSecretManager:
         decrypted = secret_manager.decrypt(encrypted)
 
         assert decrypted == special_text
+
+    def test_bytes_encryption_decryption(self, secret_manager):
+        """Test encryption and decryption of raw bytes"""
+        original = bytes(range(256))
+        encrypted = secret_manager.encrypt_bytes(original)
+
+        assert isinstance(encrypted, bytes)
+        assert secret_manager.decrypt_bytes(encrypted) == original
+        assert secret_manager.decrypt_bytes(secret_manager.encrypt("text").encode()) == b"text"
+
+    def test_decrypt_many(self, secret_manager):
+        """Test batch decryption matches single decryption"""
+        texts = ["first", "", "!@#$%^&*()", "a" * 100]
+        encrypted = [secret_manager.encrypt(text) for text in texts]
+
+        assert secret_manager.decrypt_many(encrypted) == texts
+        assert secret_manager.decrypt_many([]) == []
+
+    def test_encrypt_many(self, secret_manager):
+        """Test batch encryption produces unique tokens readable by Fernet"""
+        key = SecretManager.generate_key()
+        manager = SecretManager(key)
+        texts = ["first", "", "!@#$%^&*()", "a" * 100, "first"]
+        encrypted = manager.encrypt_many(texts)
+
+        assert len(set(encrypted)) == len(texts)
+        assert manager.decrypt_many(encrypted) == texts
+        assert [Fernet(key).decrypt(token.encode()).decode() for token in encrypted] == texts
+        assert secret_manager.encrypt_many([]) == []
+
+    def test_decrypt_many_tampered_data(self, secret_manager):
+        """Test batch decryption rejects tampered and foreign tokens"""
+        token = bytearray(secret_manager.encrypt("Test message").encode())
+        token[-5] ^= 1
+        foreign = SecretManager(SecretManager.generate_key()).encrypt("Test message")
+
+        with pytest.raises(InvalidToken):
+            secret_manager.decrypt_many([token.decode()])
+        with pytest.raises(InvalidToken):
+            secret_manager.decrypt_many([foreign])
+
+    def test_interoperable_with_cryptography_fernet(self):
+        """Test that tokens are compatible with the reference Fernet implementation"""
+        key = SecretManager.generate_key()
+        token = Fernet(key).encrypt(b"Interop").decode()
+
+        assert SecretManager(key).decrypt(token) == "Interop"
+        assert SecretManager(key).decrypt_many([token]) == ["Interop"]
+
+    def test_legacy_double_encoded_tokens(self, secret_manager):
+        """Test that tokens base64 encoded a second time still decrypt"""
+        legacy = base64.b64encode(secret_manager.encrypt("Legacy").encode()).decode()
+
+        assert secret_manager.decrypt(legacy) == "Legacy"
+        assert secret_manager.decrypt_many([legacy]) == ["Legacy"]
+
+    def test_encrypt_returns_fernet_token(self, secret_manager):
+        """Test that encrypted data is a plain Fernet token"""
+        encrypted = secret_manager.encrypt("Test message")
+
+        assert encrypted.startswith("gAAAAA")
+
+    def test_bulk_encryption_decryption(self, secret_manager):
+        """Test AES-GCM bulk encryption round-trips and uses unique nonces"""
+        items = [b"first", b"", bytes(range(256)), b"first"]
+        encrypted = secret_manager.encrypt_bulk(items)
+
+        assert len(set(encrypted)) == len(items)
+        assert all(len(item) == len(plain) + 28 for item, plain in zip(encrypted, items))
+        assert secret_manager.decrypt_bulk(encrypted) == items
+        assert secret_manager.encrypt_bulk([]) == []
+
+    def test_decrypt_bulk_tampered_data(self, secret_manager):
+        """Test bulk decryption rejects tampered and foreign ciphertexts"""
+        tampered = bytearray(secret_manager.encrypt_bulk([b"Test message"])[0])
+        tampered[-1] ^= 1
+        foreign = SecretManager(SecretManager.generate_key()).encrypt_bulk([b"Test message"])
+
+        with pytest.raises(InvalidToken):
+            secret_manager.decrypt_bulk([bytes(tampered)])
+        with pytest.raises(InvalidToken):
+            secret_manager.decrypt_bulk(foreign)
+
+class TestRFernetAdapter:
+    """Test suite for the rfernet adapter, run against a stand-in rfernet module"""
+
+    class DecryptionError(Exception):
+        """Stand-in for rfernet.DecryptionError"""
+
+    class StrFernet:
+        """Stand-in for rfernet.Fernet, which takes and returns tokens as str"""
+
+        def __init__(self, key: str):
+            assert isinstance(key, str)
+            self._fernet = Fernet(key)
+
+        def encrypt(self, data: bytes) -> str:
+            assert isinstance(data, bytes)
+            return self._fernet.encrypt(data).decode()
+
+        def decrypt(self, token: str) -> bytes:
+            assert isinstance(token, str)
+            try:
+                return self._fernet.decrypt(token)
+            except InvalidToken as exc:
+                raise TestRFernetAdapter.DecryptionError from exc
+
+    @pytest.fixture(autouse=True)
+    def fake_rfernet(self, monkeypatch):
+        """Install the stand-in rfernet module for the duration of a test"""
+        module = SimpleNamespace(Fernet=self.StrFernet, DecryptionError=self.DecryptionError)
+        monkeypatch.setitem(globals(), 'rfernet', module)
+        return module
+
+    def test_secret_manager_uses_adapter(self):
+        """Test that SecretManager picks the adapter when rfernet is available"""
+        secret_manager = SecretManager(SecretManager.generate_key())
+
+        assert isinstance(secret_manager.fernet, _RFernetAdapter)
+        assert secret_manager.decrypt(secret_manager.encrypt("Hello, World!")) == "Hello, World!"
+
+    def test_batches_use_adapter(self, monkeypatch):
+        """Test that batch encryption and decryption go through rfernet as well"""
+        secret_manager = SecretManager(SecretManager.generate_key())
+        calls = []
+        decrypt = self.StrFernet.decrypt
+
+        def recording_decrypt(fernet, token: str) -> bytes:
+            calls.append(token)
+            return decrypt(fernet, token)
+
+        monkeypatch.setattr(self.StrFernet, 'decrypt', recording_decrypt)
+        tokens = secret_manager.encrypt_many(["first", "second"])
+
+        assert secret_manager.decrypt_many(tokens) == ["first", "second"]
+        assert calls == tokens
+        with pytest.raises(InvalidToken):
+            secret_manager.decrypt_many(["gAAAAé"])
+
+    def test_bytes_mapping(self):
+        """Test that the adapter maps rfernet str tokens to and from bytes"""
+        key = SecretManager.generate_key()
+        adapter = _RFernetAdapter(key.encode())
+        token = adapter.encrypt(b"Test message")
+
+        assert isinstance(token, bytes)
+        assert adapter.decrypt(token) == b"Test message"
+        assert Fernet(key).decrypt(token) == b"Test message"
+
+    def test_decryption_errors_raise_invalid_token(self):
+        """Test that rfernet and decoding failures surface as InvalidToken"""
+        adapter = _RFernetAdapter(SecretManager.generate_key())
+        foreign = Fernet(Fernet.generate_key()).encrypt(b"Test message")
+
+        with pytest.raises(InvalidToken) as excinfo:
+            adapter.decrypt(foreign)
+        assert isinstance(excinfo.value.__cause__, self.DecryptionError)
+        with pytest.raises(InvalidToken):
+            adapter.decrypt(b"\xff\xfe")
@@ -3,8 +3,9 @@ This module provides logging functionality for the test automation framework.
 
 The module handles:
 - Setting up logging with configurable log levels
-- Writing logs to timestamped files in a logs directory
+- Writing logs to timestamped files in a logs directory, one per pytest-xdist worker
 - Formatting log messages with timestamps and log levels
+- Sharing a single file handler across repeated logger setups
 - Testing logger initialization and formatting
 
 Key features:
@@ -22,26 +23,28 @@ Usage:
 import io
 import logging
 import os
-from datetime import datetime
 import pytest
 
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+from lib.utils.paths import PROJECT_ROOT, ensure_dir, run_timestamp
+
 LOGS_DIR = os.path.join(PROJECT_ROOT, "logs")
 LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
 DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
 
-os.makedirs(LOGS_DIR, exist_ok=True)
-INITIAL_FILES = set(os.listdir(LOGS_DIR))
+ensure_dir(LOGS_DIR)
+
+_RUN_TIMESTAMP = run_timestamp()
+log_filename = os.path.join(LOGS_DIR, f"run-{_RUN_TIMESTAMP}.log")
 
-log_filename = os.path.join(LOGS_DIR, f"run-{datetime.now():%Y-%m-%d_%H-%M-%S}.log")
+_file_handler = logging.FileHandler(log_filename, delay=True)
+_file_handler.setFormatter(logging.Formatter(fmt=LOG_FORMAT, datefmt=DATE_FORMAT))
 
 def setup_logger(log_level: str = 'INFO') -> logging.Logger:
     """Sets up a logger with a filename based on the current date and time"""
     logger = logging.getLogger(__name__)
     logger.setLevel(getattr(logging, log_level.upper(), logging.INFO))
-    handler = logging.FileHandler(log_filename)
-    handler.setFormatter(logging.Formatter(fmt=LOG_FORMAT, datefmt=DATE_FORMAT))
-    logger.addHandler(handler)
+    if _file_handler not in logger.handlers:
+        logger.addHandler(_file_handler)
     return logger
 
 class TestLogger:
@@ -84,7 +87,7 @@ class TestLogger:
         log_output = stream.getvalue()
         assert test_message in log_output
         assert 'INFO' in log_output
-        assert datetime.now().strftime('%Y-%m-%d') in log_output
+        assert _RUN_TIMESTAMP[:10] in log_output
         assert ' - ' in log_output
         logger.removeHandler(handler)
         stream.close()
@@ -93,15 +96,18 @@ class TestLogger:
         """Test that the logger writes messages to a file"""
         test_message = 'Test file output message'
         logger.info(test_message)
-        current_files = set(os.listdir(LOGS_DIR))
-        new_files = current_files - INITIAL_FILES
-        assert len(new_files) == 1
-        log_file = os.path.join(LOGS_DIR, list(new_files)[0])
-        with open(log_file, 'r', encoding='utf-8') as f:
+        assert os.path.exists(log_filename)
+        with open(log_filename, 'r', encoding='utf-8') as f:
             content = f.read()
             assert test_message in content
             assert 'INFO' in content
-            assert datetime.now().strftime('%Y-%m-%d') in content
+            assert _RUN_TIMESTAMP[:10] in content
+
+    def test_logger_setup_is_idempotent(self, logger: logging.Logger):
+        """Test that repeated setup does not add duplicate handlers"""
+        for level in ('INFO', 'DEBUG', 'INFO'):
+            assert setup_logger(level) is logger
+        assert logger.handlers == [_file_handler]
 
     @pytest.mark.parametrize("level_name,level_value", [
         ('DEBUG', logging.DEBUG),
@@ -0,0 +1,32 @@
+"""
+This module provides the filesystem locations shared by the test automation framework.
+
+The module handles:
+- Resolving the project root once at import
+- Creating artifact directories at most once per process
+- Naming the output files of a run so parallel pytest-xdist workers never share one
+
+Usage:
+    from lib.utils.paths import PROJECT_ROOT, ensure_dir
+
+    logs_dir = ensure_dir(os.path.join(PROJECT_ROOT, "logs"))
+"""
+import os
+from datetime import datetime
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+
+_ENSURED_DIRS: set[str] = set()
+
+def ensure_dir(path: str) -> str:
+    """Creates a directory unless it was already ensured by this process"""
+    if path not in _ENSURED_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _ENSURED_DIRS.add(path)
+    return path
+
+def run_timestamp() -> str:
+    """Returns the timestamp naming this run's output files, suffixed with the xdist worker"""
+    timestamp = f"{datetime.now():%Y-%m-%d_%H-%M-%S}"
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    return f"{timestamp}-{worker}" if worker else timestamp
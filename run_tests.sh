@@ -2,13 +2,17 @@
 
 show_help() {
     cat << EOF
-Usage: $0 -p <provider> [-e <environment>] [-t <test_path>]
+Usage: $0 -p <provider> [-e <environment>] [-t <test_path>] [-n <workers>]
 
 Options:
   -p, --provider     Provider to run tests against (required)
   -t, --test-path    Specific test path to run (default: tests/)
+  -n, --workers      Number of parallel pytest-xdist workers, one per device
   -h, --help         Show this help message
 
+Parallel local runs need one device per worker, given as a comma separated list in
+DEVICE_UDID_POOL (e.g. DEVICE_UDID_POOL="udid-1,udid-2" $0 -p local-android -n 2).
+
 Available providers:
   local-android
   bitbar-android
@@ -57,15 +61,17 @@ check_env_vars() {
 
 TEST_PATH="tests/"
 
-while getopts ":p:t:h-:" opt; do
+while getopts ":p:t:n:h-:" opt; do
     case $opt in
         p) PROVIDER=$OPTARG ;;
         t) TEST_PATH=$OPTARG ;;
+        n) WORKERS=$OPTARG ;;
         h) show_help; exit 0 ;;
         -)
             case "${OPTARG}" in
                 provider) PROVIDER="${!OPTIND}"; OPTIND=$((OPTIND + 1)) ;;
                 test-path) TEST_PATH="${!OPTIND}"; OPTIND=$((OPTIND + 1)) ;;
+                workers) WORKERS="${!OPTIND}"; OPTIND=$((OPTIND + 1)) ;;
                 help) show_help; exit 0 ;;
                 *) echo "Unknown option --${OPTARG}"; show_help; exit 1 ;;
             esac
@@ -139,6 +145,13 @@ case "$PROVIDER" in
         ;;
 esac
 
+if [[ -n "$WORKERS" ]]; then
+    PYTEST_ARGS="$PYTEST_ARGS -n $WORKERS --dist=loadfile"
+    if [[ -n "$DEVICE_UDID_POOL" ]]; then
+        PYTEST_ARGS="$PYTEST_ARGS --device_udid_pool=\"${DEVICE_UDID_POOL}\""
+    fi
+fi
+
 PYTEST_ARGS=$(echo "$PYTEST_ARGS" | tr -s ' ' | tr '\n' ' ')
 FINAL_CMD="$BASE_CMD $PYTEST_ARGS $ENV_ARGS $TEST_PATH"
 
@@ -1,10 +1,27 @@
 """
 This module contains test configuration and fixtures for pytest.
+
+Tests can run in parallel with pytest-xdist, one device per worker:
+    pytest -n <devices> --dist=loadfile --device_udid_pool=<udid1>,<udid2> --system_port=8200
+Each worker takes the pool entry matching its index and offsets the system port by it.
+Leave a couple of cores free for the Appium server and emulators.
 """
-from dataclasses import fields
+import copy
+import hashlib
+import logging
+import os
+import traceback
+from dataclasses import Field, fields
+from functools import lru_cache
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock
 
 import pytest
+from selenium.common.exceptions import TimeoutException
 
+from lib.data import DataManager
+from lib.drivers import DriverSession, WebDriverFactory
 from lib.models import (
     AppiumProperties,
     BitbarOptions,
@@ -14,118 +31,305 @@ from lib.models import (
 )
 from lib.types import (
     ApplicationType,
+    ExecutionMode,
     PlatformType,
-    ProviderType
+    ProviderType,
+    RecordMode
 )
+from lib.utils.attachments import Attachments
 from lib.utils.logger import setup_logger
 
-def pytest_addoption(parser: pytest.Parser):
-    """Add command line options for test configuration"""
-    dataclass_types = {
-        "execution_properties": ExecutionProperties,
-        "framework_properties": FrameworkProperties,
-        "appium_properties": AppiumProperties
-    }
+_ENUM_TYPES = (ApplicationType, ExecutionMode, PlatformType, ProviderType, RecordMode)
+_SESSION_PROPERTIES = pytest.StashKey[
+    tuple[ExecutionProperties, FrameworkProperties, AppiumProperties]
+]()
+_DRIVER_SESSION = pytest.StashKey[DriverSession]()
+_PROPERTY_TYPES = {
+    "execution_properties": ExecutionProperties,
+    "framework_properties": FrameworkProperties,
+    "appium_properties": AppiumProperties
+}
+
+@lru_cache(maxsize=None)
+def _dataclass_fields(dataclass_type: type) -> tuple[tuple[Field, bool], ...]:
+    """Returns the fields of a dataclass paired with whether each field holds an enum"""
+    return tuple((field, field.type in _ENUM_TYPES) for field in fields(dataclass_type))
+
+@lru_cache(maxsize=None)
+def _enum_choices(enum_type: type) -> tuple[str, ...]:
+    """Returns the command line choices for an enum type"""
+    return tuple(member.value for member in enum_type)
 
-    added_options = set()
-    logger = setup_logger()
+def _build_option_specs() -> list[tuple[str, dict]]:
+    """Walks the property dataclasses once and returns the command line option specs"""
+    specs = {}
+    option_sources = [("", dataclass_type) for dataclass_type in _PROPERTY_TYPES.values()]
+    option_sources += [("bitbar_", BitbarOptions), ("saucelabs_", SauceLabsOptions)]
 
-    for dataclass_type in dataclass_types.values():
+    for prefix, dataclass_type in option_sources:
         instance = dataclass_type()
-        for field in fields(dataclass_type):
-            option_name = f"--{field.name}"
-            if option_name not in added_options:
-                default_value = getattr(instance, field.name)
-                if field.type in (ApplicationType, ProviderType, PlatformType):
-                    parser.addoption(
-                        option_name,
-                        action="store",
-                        default=default_value.value,
-                        choices=[t.value for t in field.type],
-                    )
-                    logger.info(
-                        "Added option %s with default: %s", option_name, default_value.value
-                    )
-                else:
-                    parser.addoption(
-                        option_name, action="store", default=default_value, type=field.type
-                    )
-                    logger.info(
-                        "Added option %s with default: %s", option_name, default_value
-                    )
-                added_options.add(option_name)
-
-    bitbar_instance = BitbarOptions()
-    for field in fields(BitbarOptions):
-        option_name = f"--bitbar_{field.name}"
-        if option_name not in added_options:
-            default_value = getattr(bitbar_instance, field.name)
-            parser.addoption(
-                option_name, action="store", default=default_value, type=field.type
-            )
-            logger.info(
-                "Added option %s with default: %s", option_name, default_value
-            )
-            added_options.add(option_name)
-
-    saucelabs_instance = SauceLabsOptions()
-    for field in fields(SauceLabsOptions):
-        option_name = f"--saucelabs_{field.name}"
-        if option_name not in added_options:
-            default_value = getattr(saucelabs_instance, field.name)
-            parser.addoption(
-                option_name, action="store", default=default_value, type=field.type
-            )
-            logger.info(
-                "Added option %s with default: %s", option_name, default_value
-            )
-            added_options.add(option_name)
-
-def initialize_dataclass(dataclass_instance, request, prefix=""):
+        for field, is_enum in _dataclass_fields(dataclass_type):
+            option_name = f"--{prefix}{field.name}"
+            if option_name in specs:
+                continue
+            default_value = getattr(instance, field.name)
+            # A dedicated dest keeps options such as --log_level apart from pytest's --log-level
+            dest = f"properties_{prefix}{field.name}"
+            if is_enum:
+                specs[option_name] = {
+                    "action": "store",
+                    "dest": dest,
+                    "default": default_value.value,
+                    "choices": _enum_choices(field.type),
+                }
+            elif field.type is bool:
+                specs[option_name] = {
+                    "action": "store_true", "dest": dest, "default": default_value
+                }
+            else:
+                specs[option_name] = {
+                    "action": "store", "dest": dest, "default": default_value, "type": field.type
+                }
+    return list(specs.items())
+
+_OPTION_SPECS = _build_option_specs()
+
+def pytest_addoption(parser: pytest.Parser):
+    """Add command line options for test configuration"""
+    for option_name, option_kwargs in _OPTION_SPECS:
+        parser.addoption(option_name, **option_kwargs)
+    setup_logger().info("Added %d options", len(_OPTION_SPECS))
+
+def initialize_dataclass(dataclass_instance, config: pytest.Config, prefix=""):
     """Helper function to initialize dataclass fields from pytest options"""
     if not hasattr(dataclass_instance, '__dataclass_fields__'):
         raise TypeError(f"{dataclass_instance} is not a dataclass instance")
 
-    for field in fields(dataclass_instance):
+    for field, is_enum in _dataclass_fields(type(dataclass_instance)):
         option_name = f"--{prefix}{field.name}" if prefix else f"--{field.name}"
         default_value = getattr(dataclass_instance, field.name, None)
-        value = request.config.getoption(option_name, default_value)
-        if field.type in (ApplicationType, ProviderType, PlatformType):
+        value = config.getoption(option_name, default_value)
+        if is_enum:
             value = field.type(value)
         setattr(dataclass_instance, field.name, value)
+    return dataclass_instance
 
-@pytest.fixture(scope="class")
-def properties(request: pytest.FixtureRequest):
-    """Pytest fixture that initializes and sets properties for test configuration"""
-    dataclass_types = {
-        "execution_properties": ExecutionProperties,
-        "framework_properties": FrameworkProperties,
-        "appium_properties": AppiumProperties
-    }
-
-    logger = setup_logger()
-    for property_name, dataclass_type in dataclass_types.items():
-        dataclass_instance = dataclass_type()
-        initialize_dataclass(dataclass_instance, request)
-
-        if property_name == "appium_properties":
-            bitbar_instance = BitbarOptions()
-            for field in fields(BitbarOptions):
-                option_name = f"--bitbar_{field.name}"
-                value = request.config.getoption(option_name)
-                setattr(bitbar_instance, field.name, value)
-            dataclass_instance.bitbar_options = bitbar_instance
-
-            saucelabs_instance = SauceLabsOptions()
-            for field in fields(SauceLabsOptions):
-                option_name = f"--saucelabs_{field.name}"
-                value = request.config.getoption(option_name)
-                setattr(saucelabs_instance, field.name, value)
-            dataclass_instance.saucelabs_options = saucelabs_instance
+def _worker_index() -> int:
+    """Returns the index of the current pytest-xdist worker, or 0 without xdist"""
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+    return int(worker.removeprefix("gw") or 0)
+
+def _worker_count(config: pytest.Config) -> int:
+    """Returns the number of pytest-xdist workers of the run, or 1 without xdist"""
+    if "PYTEST_XDIST_WORKER_COUNT" in os.environ:
+        return int(os.environ["PYTEST_XDIST_WORKER_COUNT"])
+    numprocesses = getattr(config.option, "numprocesses", None)
+    return numprocesses if isinstance(numprocesses, int) and numprocesses > 0 else 1
+
+def _assign_worker_device(
+    appium_properties: AppiumProperties,
+    provider: ProviderType,
+    worker_index: int,
+    worker_count: int
+):
+    """Helper function to give each xdist worker its own device and system port"""
+    pool = [udid.strip() for udid in appium_properties.device_udid_pool.split(",") if udid.strip()]
+    if pool and worker_count > len(pool):
+        raise ValueError(
+            f"{worker_count} xdist workers need {worker_count} devices, "
+            f"but --device_udid_pool only lists {len(pool)}"
+        )
+    if not pool and worker_count > 1 and provider == ProviderType.LOCAL:
+        raise ValueError(
+            f"{worker_count} xdist workers against local devices need --device_udid_pool "
+            "so each worker gets its own device"
+        )
+    if pool:
+        appium_properties.device_udid = pool[worker_index]
+    if appium_properties.system_port:
+        appium_properties.system_port += worker_index
+
+def _session_properties(
+    config: pytest.Config
+) -> tuple[ExecutionProperties, FrameworkProperties, AppiumProperties]:
+    """Builds the execution, framework and Appium properties once per pytest session"""
+    if _SESSION_PROPERTIES not in config.stash:
+        execution_properties = initialize_dataclass(ExecutionProperties(), config)
+        appium_properties = initialize_dataclass(AppiumProperties(), config)
+        appium_properties.bitbar_options = initialize_dataclass(BitbarOptions(), config, "bitbar_")
+        appium_properties.saucelabs_options = initialize_dataclass(
+            SauceLabsOptions(), config, "saucelabs_"
+        )
+        _assign_worker_device(
+            appium_properties,
+            execution_properties.provider,
+            _worker_index(),
+            _worker_count(config)
+        )
+        config.stash[_SESSION_PROPERTIES] = (
+            execution_properties,
+            initialize_dataclass(FrameworkProperties(), config),
+            appium_properties
+        )
+    return config.stash[_SESSION_PROPERTIES]
+
+def _driver_session(config: pytest.Config) -> DriverSession:
+    """Returns the driver session shared by the pytest session"""
+    if _DRIVER_SESSION not in config.stash:
+        execution_properties, framework_properties, appium_properties = _session_properties(config)
+        config.stash[_DRIVER_SESSION] = DriverSession(
+            WebDriverFactory(execution_properties),
+            appium_properties,
+            framework_properties.time_session_recycle
+        )
+    return config.stash[_DRIVER_SESSION]
+
+def _validate_record_mode(execution_properties: ExecutionProperties, reruns: int | None):
+    """Helper function to reject record modes that could never produce a recording"""
+    # on-failure records the rerun of a failed test, which only pytest-rerunfailures performs
+    if execution_properties.record_mode == RecordMode.ON_FAILURE and not reruns:
+        raise ValueError("--record_mode=on-failure records reruns only and needs --reruns >= 1")
+
+def pytest_configure(config: pytest.Config):
+    """Reject option combinations that cannot work before any test starts"""
+    try:
+        execution_properties, _, appium_properties = _session_properties(config)
+        _validate_record_mode(execution_properties, getattr(config.option, "reruns", 0))
+        DriverSession.validate_properties(appium_properties)
+    except ValueError as exc:
+        raise pytest.UsageError(str(exc)) from exc
 
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]):
+    """Start creating the driver in the background once selected tests are known to need it"""
+    # trylast so -k/-m deselection has already removed the tests that will not run
+    if config.option.collectonly:
+        return
+    if any("driver" in getattr(item, "fixturenames", ()) for item in items):
+        _driver_session(config).prewarm()
+
+def pytest_sessionfinish(session: pytest.Session):
+    """Quit a prewarmed driver even if no test ended up requesting it"""
+    driver_session = session.config.stash.get(_DRIVER_SESSION, None)
+    if driver_session is not None:
+        driver_session.quit()
+
+@pytest.fixture(scope="session")
+def execution_properties(request: pytest.FixtureRequest) -> ExecutionProperties:
+    """Pytest fixture that provides the execution properties of the session"""
+    return _session_properties(request.config)[0]
+
+@pytest.fixture(scope="session")
+def framework_properties(request: pytest.FixtureRequest) -> FrameworkProperties:
+    """Pytest fixture that provides the framework properties of the session"""
+    return _session_properties(request.config)[1]
+
+@pytest.fixture(scope="session")
+def appium_properties(request: pytest.FixtureRequest) -> AppiumProperties:
+    """Pytest fixture that provides the Appium properties of the session"""
+    return _session_properties(request.config)[2]
+
+@pytest.fixture(scope="session")
+def logger(execution_properties: ExecutionProperties) -> logging.Logger:
+    """Pytest fixture that configures the framework logger once per session"""
+    return setup_logger(execution_properties.log_level)
+
+@pytest.fixture(scope="class")
+def properties(
+    request: pytest.FixtureRequest,
+    execution_properties: ExecutionProperties,
+    framework_properties: FrameworkProperties,
+    appium_properties: AppiumProperties,
+    logger: logging.Logger
+):
+    """Pytest fixture that sets the session properties on the test class"""
+    for property_name, dataclass_instance in (
+        ("execution_properties", execution_properties),
+        ("framework_properties", framework_properties),
+        ("appium_properties", appium_properties)
+    ):
         setattr(request.cls, property_name, dataclass_instance)
         logger.info("Initialized %s with values: %s", property_name, dataclass_instance)
 
+@pytest.fixture(scope="session")
+def test_data_manager(framework_properties: FrameworkProperties) -> DataManager:
+    """Pytest fixture that loads the test data once per session"""
+    return DataManager(framework_properties)
+
+@pytest.fixture
+def test_data(test_data_manager: DataManager) -> dict:
+    """Pytest fixture that provides a private copy of the test data for tests that mutate it"""
+    return copy.deepcopy(test_data_manager.get_all_test_data())
+
+@pytest.fixture(scope="session")
+def driver_session(request: pytest.FixtureRequest):
+    """Pytest fixture that shares one driver session across the whole test session"""
+    session = _driver_session(request.config)
+    yield session
+    session.quit()
+
+@pytest.fixture
+def driver(driver_session: DriverSession):
+    """Pytest fixture that provides the shared driver and resets the app after each test"""
+    yield driver_session.get_driver()
+    driver_session.reset_app()
+
+@pytest.fixture(scope="session")
+def session_attachments(
+    framework_properties: FrameworkProperties,
+    appium_properties: AppiumProperties
+) -> Attachments:
+    """Pytest fixture that creates the artifact attachments helper once per session"""
+    return Attachments(None, framework_properties, appium_properties.platform)
+
+@pytest.fixture
+def attachments(session_attachments: Attachments, driver) -> Attachments:
+    """Pytest fixture that prepares the shared attachments helper for the current test"""
+    session_attachments.reset_per_test(driver)
+    return session_attachments
+
+@lru_cache(maxsize=None)
+def _source_hash(path: Path) -> str:
+    """Returns the hash of a test file's source"""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+def artifact_cache_dir(
+    item: pytest.Item,
+    execution_properties: ExecutionProperties
+) -> Path | None:
+    """Returns the artifact cache directory of a test, or None when --cached_artifacts is off"""
+    cache = getattr(item.config, "cache", None)
+    if cache is None or not execution_properties.cached_artifacts:
+        return None
+    key = hashlib.sha256(f"{item.nodeid}:{_source_hash(item.path)}".encode()).hexdigest()
+    return cache.mkdir("artifacts") / key[:32]
+
+def has_cached_artifacts(item: pytest.Item, cache_dir: Path | None) -> bool:
+    """Checks whether artifacts of a previous passing run of the unchanged test are cached"""
+    if cache_dir is None or not cache_dir.is_dir():
+        return False
+    return item.nodeid not in item.config.cache.get("cache/lastfailed", {})
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item: pytest.Item, call: pytest.CallInfo):
+    """Capture test artifacts once the outcome of a test call is known"""
+    outcome = yield
+    report = outcome.get_result()
+    if report.when != "call" or getattr(item.instance, "attachments", None) is None:
+        return
+
+    include_screenshot = False
+    # Expected failures and strict xpasses carry no failure worth a screenshot
+    if report.failed and call.excinfo is not None and not hasattr(report, "wasxfail"):
+        item.instance.logger.error("Test %s failed: %s", item.name, call.excinfo.value)
+        include_screenshot = call.excinfo.errisinstance((AssertionError, TimeoutException))
+    # A broken driver session must cost this test its artifacts, not abort the whole run
+    try:
+        item.instance.capture_artifacts(include_screenshot=include_screenshot, passed=report.passed)
+    except Exception as exc:
+        item.instance.logger.error("Capturing artifacts of %s failed: %s", item.name, exc)
+        report.sections.append(("Artifact capture error", traceback.format_exc()))
+
 @pytest.mark.usefixtures("properties")
 class TestProperties:
     """Test cases for properties fixture"""
@@ -141,8 +345,14 @@ class TestProperties:
         assert isinstance(self.execution_properties.application_type, ApplicationType)
         assert hasattr(self.execution_properties, "provider")
         assert isinstance(self.execution_properties.provider, ProviderType)
+        assert hasattr(self.execution_properties, "mode")
+        assert isinstance(self.execution_properties.mode, ExecutionMode)
         assert hasattr(self.execution_properties, "log_level")
         assert isinstance(self.execution_properties.log_level, str)
+        assert hasattr(self.execution_properties, "record_mode")
+        assert isinstance(self.execution_properties.record_mode, RecordMode)
+        assert hasattr(self.execution_properties, "cached_artifacts")
+        assert isinstance(self.execution_properties.cached_artifacts, bool)
         assert hasattr(self.execution_properties, "test_grep")
         assert isinstance(self.execution_properties.test_grep, str)
         assert hasattr(self.execution_properties, "test_spec")
@@ -160,6 +370,12 @@ class TestProperties:
         assert isinstance(self.framework_properties.time_timeout, float)
         assert hasattr(self.framework_properties, "time_interval")
         assert isinstance(self.framework_properties.time_interval, float)
+        assert hasattr(self.framework_properties, "time_presence_timeout")
+        assert isinstance(self.framework_properties.time_presence_timeout, float)
+        assert hasattr(self.framework_properties, "time_presence_interval")
+        assert isinstance(self.framework_properties.time_presence_interval, float)
+        assert hasattr(self.framework_properties, "time_session_recycle")
+        assert isinstance(self.framework_properties.time_session_recycle, float)
 
     def test_appium_properties_initialized(self):
         """Verify AppiumProperties are correctly initialized"""
@@ -179,6 +395,12 @@ class TestProperties:
         assert isinstance(self.appium_properties.device_udid, str)
         assert hasattr(self.appium_properties, "device_name")
         assert isinstance(self.appium_properties.device_name, str)
+        assert hasattr(self.appium_properties, "device_udid_pool")
+        assert isinstance(self.appium_properties.device_udid_pool, str)
+        assert hasattr(self.appium_properties, "system_port")
+        assert isinstance(self.appium_properties.system_port, int)
+        assert hasattr(self.appium_properties, "clear_app_state")
+        assert isinstance(self.appium_properties.clear_app_state, bool)
 
         assert isinstance(self.appium_properties.bitbar_options, BitbarOptions)
         assert hasattr(self.appium_properties.bitbar_options, "api_key")
@@ -197,3 +419,147 @@ class TestProperties:
         assert isinstance(self.appium_properties.saucelabs_options.username, str)
         assert hasattr(self.appium_properties.saucelabs_options, "access_key")
         assert isinstance(self.appium_properties.saucelabs_options.access_key, str)
+
+    def test_option_specs_built_once(self):
+        """Verify option specs are unique and include the provider options"""
+        option_names = [option_name for option_name, _ in _OPTION_SPECS]
+        assert len(option_names) == len(set(option_names))
+        assert "--bitbar_api_key" in option_names
+        assert "--saucelabs_access_key" in option_names
+        assert dict(_OPTION_SPECS)["--platform"]["choices"] == _enum_choices(PlatformType)
+
+class TestWorkerDevices:
+    """Test cases for assigning devices to pytest-xdist workers"""
+
+    def test_worker_index(self, monkeypatch: pytest.MonkeyPatch):
+        """Verify the worker index is read from the xdist worker id"""
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw3")
+        assert _worker_index() == 3
+        monkeypatch.delenv("PYTEST_XDIST_WORKER")
+        assert _worker_index() == 0
+
+    def test_assign_worker_device(self):
+        """Verify each worker gets its own device and system port"""
+        appium_properties = AppiumProperties(
+            device_udid="default", device_udid_pool="udid-0, udid-1", system_port=8200
+        )
+        _assign_worker_device(appium_properties, ProviderType.LOCAL, 1, 2)
+
+        assert appium_properties.device_udid == "udid-1"
+        assert appium_properties.system_port == 8201
+
+    def test_worker_count(self, monkeypatch: pytest.MonkeyPatch):
+        """Verify the worker count is read from xdist, defaulting to a single worker"""
+        config = SimpleNamespace(option=SimpleNamespace(numprocesses=3))
+        monkeypatch.delenv("PYTEST_XDIST_WORKER_COUNT", raising=False)
+        assert _worker_count(config) == 3
+        assert _worker_count(SimpleNamespace(option=SimpleNamespace())) == 1
+        monkeypatch.setenv("PYTEST_XDIST_WORKER_COUNT", "4")
+        assert _worker_count(config) == 4
+
+    def test_more_workers_than_devices_rejected(self):
+        """Verify two workers are never given the same device"""
+        appium_properties = AppiumProperties(device_udid_pool="udid-0,udid-1")
+
+        with pytest.raises(ValueError, match="3 xdist workers need 3 devices"):
+            _assign_worker_device(appium_properties, ProviderType.LOCAL, 2, 3)
+
+    def test_local_workers_without_pool_rejected(self):
+        """Verify parallel local runs require a device pool while cloud runs do not"""
+        with pytest.raises(ValueError, match="need --device_udid_pool"):
+            _assign_worker_device(AppiumProperties(), ProviderType.LOCAL, 0, 2)
+        _assign_worker_device(AppiumProperties(), ProviderType.BITBAR, 1, 2)
+
+    def test_assign_worker_device_without_pool(self):
+        """Verify the configured device is kept when no pool is given"""
+        appium_properties = AppiumProperties(device_udid="default")
+        _assign_worker_device(appium_properties, ProviderType.BITBAR, 2, 3)
+
+        assert appium_properties.device_udid == "default"
+        assert appium_properties.system_port == 0
+
+class TestRecordModeValidation:
+    """Test cases for rejecting record modes that cannot record"""
+
+    def test_on_failure_requires_reruns(self):
+        """Verify on-failure recording is rejected without reruns"""
+        execution_properties = ExecutionProperties(record_mode=RecordMode.ON_FAILURE)
+
+        with pytest.raises(ValueError, match="needs --reruns"):
+            _validate_record_mode(execution_properties, 0)
+        with pytest.raises(ValueError, match="needs --reruns"):
+            _validate_record_mode(execution_properties, None)
+        _validate_record_mode(execution_properties, 1)
+
+    def test_other_modes_ignore_reruns(self):
+        """Verify the other record modes do not depend on reruns"""
+        _validate_record_mode(ExecutionProperties(record_mode=RecordMode.ALWAYS), 0)
+        _validate_record_mode(ExecutionProperties(record_mode=RecordMode.NEVER), 0)
+
+class TestDataFixtures:
+    """Test cases for the test data fixtures"""
+
+    def test_test_data_is_private_copy(self, test_data: dict, test_data_manager: DataManager):
+        """Verify tests get a mutable copy of the session test data"""
+        assert test_data == test_data_manager.get_all_test_data()
+        test_data["mutated"] = True
+        assert "mutated" not in test_data_manager.get_all_test_data()
+
+class TestMakeReportHook:
+    """Test cases for the artifact capturing makereport hook"""
+
+    @staticmethod
+    def run_hook(item, report) -> None:
+        """Drive the makereport hookwrapper with a finished report"""
+        hook = pytest_runtest_makereport(item, SimpleNamespace(excinfo=None))
+        next(hook)
+        with pytest.raises(StopIteration):
+            hook.send(SimpleNamespace(get_result=lambda: report))
+
+    def test_capture_failure_is_reported(self):
+        """Verify a failing artifact capture is logged and attached instead of raised"""
+        instance = Mock()
+        instance.capture_artifacts.side_effect = RuntimeError("session gone")
+        item = SimpleNamespace(instance=instance, name="test_example")
+        report = SimpleNamespace(when="call", failed=False, passed=True, sections=[])
+
+        self.run_hook(item, report)
+
+        instance.logger.error.assert_called_once()
+        assert report.sections[0][0] == "Artifact capture error"
+        assert "session gone" in report.sections[0][1]
+
+class TestDriverPrewarm:
+    """Test cases for prewarming the driver after collection"""
+
+    @pytest.fixture
+    def driver_session(self, monkeypatch: pytest.MonkeyPatch) -> Mock:
+        """Replace the shared driver session with a mock"""
+        session = Mock(spec=DriverSession)
+        monkeypatch.setitem(globals(), "_driver_session", lambda config: session)
+        return session
+
+    @staticmethod
+    def config(collectonly: bool = False) -> SimpleNamespace:
+        """Build a minimal config for the collection hook"""
+        return SimpleNamespace(option=SimpleNamespace(collectonly=collectonly))
+
+    def test_hook_runs_after_deselection(self):
+        """Verify the hook runs last so it only sees the selected tests"""
+        assert pytest_collection_modifyitems.pytest_impl["trylast"] is True
+
+    def test_prewarm_for_driver_tests(self, driver_session: Mock):
+        """Verify the driver is prewarmed when a selected test uses it"""
+        items = [SimpleNamespace(fixturenames=["logger"]), SimpleNamespace(fixturenames=["driver"])]
+        pytest_collection_modifyitems(self.config(), items)
+
+        driver_session.prewarm.assert_called_once()
+
+    def test_no_prewarm_without_driver_tests(self, driver_session: Mock):
+        """Verify no session is opened when no selected test uses the driver"""
+        pytest_collection_modifyitems(self.config(), [SimpleNamespace(fixturenames=["logger"])])
+        pytest_collection_modifyitems(
+            self.config(collectonly=True), [SimpleNamespace(fixturenames=["driver"])]
+        )
+
+        driver_session.prewarm.assert_not_called()
@@ -24,19 +24,30 @@ Usage:
             self.send_keys(self.locator_manager.get_locator("login", "password"), password)
             self.click_element(self.locator_manager.get_locator("login", "submit"))
 """
+import logging
+import sys
 from abc import ABC, abstractmethod
+from functools import cached_property, lru_cache
 
 from appium import webdriver
 from appium.webdriver.common.appiumby import AppiumBy
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.wait import WebDriverWait
 
-from lib.locators import LocatorManager
+from lib.locators import get_locator_manager
 from lib.models import Properties
 from lib.utils.logger import setup_logger
 
+# Expected condition predicates are cached per locator tuple so repeated
+# interactions with the same element reuse one predicate instead of a new closure
+_presence_of_element_located = lru_cache(maxsize=512)(EC.presence_of_element_located)
+_presence_of_all_elements_located = lru_cache(maxsize=512)(EC.presence_of_all_elements_located)
+_element_to_be_clickable = lru_cache(maxsize=512)(EC.element_to_be_clickable)
+_visibility_of_element_located = lru_cache(maxsize=512)(EC.visibility_of_element_located)
+_invisibility_of_element_located = lru_cache(maxsize=512)(EC.invisibility_of_element_located)
+
 class AbstractPage(ABC):
     """Base abstract class for all page objects"""
     def __init__(
@@ -48,16 +59,23 @@ class AbstractPage(ABC):
         self.driver = driver
         self.properties = properties
         self.logger = setup_logger(properties.execution.log_level)
-        self.locator_manager = LocatorManager(properties.webdriver.platform)
+        self.locator_manager = get_locator_manager(properties.webdriver.platform)
         self.locators = self.locator_manager.get_locators(screen)
         self.wait = WebDriverWait(
             driver=driver,
             timeout=properties.framework.time_timeout,
             poll_frequency=properties.framework.time_interval
         )
+        self.presence_wait = WebDriverWait(
+            driver=driver,
+            timeout=properties.framework.time_presence_timeout,
+            poll_frequency=properties.framework.time_presence_interval
+        )
 
     def _log_element_action(self, action: str, locator: tuple[AppiumBy, str]):
         """Helper method to log element actions"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         self.logger.info(
             "%s: %s with type: %s",
             action,
@@ -65,24 +83,32 @@ class AbstractPage(ABC):
             locator[0]
         )
 
+    @cached_property
+    def _locator_tuples(self) -> dict[str, tuple[str, str]]:
+        """Locator tuples of the screen, built on first use"""
+        return {
+            key: (locator['type'], sys.intern(locator['value']))
+            for key, locator in self.locators.items()
+        }
+
     def _get_locator(self, key: str) -> tuple:
         """Helper method to get locator tuple"""
-        return (self.locators[key]['type'], self.locators[key]['value'])
+        return self._locator_tuples[key]
 
     def find_element(self, locator: tuple[AppiumBy, str]) -> WebElement:
         """Find element with explicit wait"""
         self._log_element_action("Finding element", locator)
-        return self.wait.until(EC.presence_of_element_located(locator))
+        return self.wait.until(_presence_of_element_located(locator))
 
     def find_elements(self, locator: tuple[AppiumBy, str]) -> list[WebElement]:
         """Find elements with explicit wait"""
         self._log_element_action("Finding elements", locator)
-        return self.wait.until(EC.presence_of_all_elements_located(locator))
+        return self.wait.until(_presence_of_all_elements_located(locator))
 
     def click_element(self, locator: tuple[AppiumBy, str]):
         """Click element with explicit wait"""
         self._log_element_action("Clicking element", locator)
-        self.wait.until(EC.element_to_be_clickable(locator)).click()
+        self.wait.until(_element_to_be_clickable(locator)).click()
 
     def send_keys(self, locator: tuple[AppiumBy, str], text: str):
         """Send keys to element with explicit wait"""
@@ -97,32 +123,26 @@ class AbstractPage(ABC):
         return self.find_element(locator).text
 
     def is_element_present(self, locator: tuple[AppiumBy, str]) -> bool:
-        """Check if element is present"""
+        """Check if element is present using a short presence wait"""
         self._log_element_action("Checking if element is present", locator)
         try:
-            self.find_element(locator)
-            return True
-        except NoSuchElementException:
-            self.logger.info(
-                "Element %s not found.",
-                locator[1]
-            )
+            return len(self.presence_wait.until(lambda driver: driver.find_elements(*locator))) > 0
         except TimeoutException:
             self.logger.info(
                 "An element couldn't be located after %s seconds.",
-                self.properties.framework.time_timeout
+                self.properties.framework.time_presence_timeout
             )
         return False
 
     def wait_for_element_visible(self, locator: tuple[AppiumBy, str]) -> WebElement | bool:
         """Wait for element to be visible"""
         self._log_element_action("Waiting for element to be visible", locator)
-        return self.wait.until(EC.visibility_of_element_located(locator))
+        return self.wait.until(_visibility_of_element_located(locator))
 
     def wait_for_element_invisible(self, locator: tuple[AppiumBy, str]) -> WebElement | bool:
         """Wait for element to be invisible"""
         self._log_element_action("Waiting for element to be invisible", locator)
-        return self.wait.until(EC.invisibility_of_element_located(locator))
+        return self.wait.until(_invisibility_of_element_located(locator))
 
     @abstractmethod
     def is_page_loaded(self) -> bool:
@@ -2,16 +2,18 @@
 Base test module containing test configuration and base test case class.
 
 This module provides:
-- Base test case class with common setup/teardown functionality
-- Driver initialization and management
+- Base test class with a fixture-driven setup/teardown lifecycle
+- Driver injection from the session-scoped driver fixture
 - Test artifact capture (screenshots, logs, recordings)
 - Platform-specific handling for Android/iOS
 
 Key features:
-- Automatic driver setup based on properties
+- One driver session reused across tests, with the app reset between them
 - Test Flight app installation on iOS
-- Screen recording capture
-- Log and screenshot capture on test completion
+- Screen recording capture, always, only on reruns of failed tests, or never
+- Log and screenshot capture on test completion, driven by the makereport hook in conftest
+- Opt-in reuse of cached artifacts for unchanged passing tests (--cached_artifacts)
+- No recordings or artifacts in playback mode (--mode=playback)
 - Platform-specific artifact handling
 
 Usage:
@@ -19,99 +21,161 @@ Usage:
         def test_valid_login(self):
             # Test implementation
             pass
-
-        def tearDown(self):
-            self._capture_artifacts()
-            super().tearDown()
 """
-import unittest
-from functools import wraps
+import logging
+from unittest.mock import Mock
 
 import pytest
-from selenium.common.exceptions import TimeoutException
 
 from lib.data import DataManager
-from lib.drivers import WebDriverFactory
-from lib.models import PlatformType, ProviderType
+from lib.models import ExecutionMode, PlatformType, ProviderType, RecordMode
 from lib.utils.attachments import Attachments
-from lib.utils.logger import setup_logger
 from tests.conftest import (
     AppiumProperties,
     ExecutionProperties,
-    FrameworkProperties
+    FrameworkProperties,
+    artifact_cache_dir,
+    has_cached_artifacts
 )
 
-@pytest.mark.usefixtures('properties')
-class BaseTestCase(unittest.TestCase):
+class BaseTestCase:
     """Base test case class for all tests"""
     appium_properties: AppiumProperties
     execution_properties: ExecutionProperties
     framework_properties: FrameworkProperties
     test_data_manager: DataManager
 
-    @staticmethod
-    def handle_assertion_error(func):
-        """Handle assertion errors"""
-        @wraps(func)
-        def wrapper(self, *args, **kwargs):
-            try:
-                return func(self, *args, **kwargs)
-            except AssertionError as e:
-                self.logger.error("Assertion failed in function %s: %s", func.__name__, str(e))
-                self.capture_artifacts(include_screenshot=True)
-                raise
-        return wrapper
-
-    @staticmethod
-    def handle_timeout_error(func):
-        """Handle timeout errors"""
-        @wraps(func)
-        def wrapper(self, *args, **kwargs):
-            try:
-                return func(self, *args, **kwargs)
-            except TimeoutException as e:
-                self.logger.error("Timeout error in function %s: %s", func.__name__, str(e))
-                self.capture_artifacts(include_screenshot=True)
-                raise
-        return wrapper
-
-    def setUp(self):
-        """Set up test case with driver, logger and attachments"""
-        super().setUp()
-
-        self.test_data_manager = DataManager(self.framework_properties)
-        self.driver = WebDriverFactory(self.execution_properties).create_driver(
-            self.appium_properties
-        )
-        self.logger = setup_logger(self.execution_properties.log_level)
-        self.attachments = Attachments(self.driver, self.framework_properties)
+    @pytest.fixture(autouse=True)
+    def _lifecycle(
+        self,
+        request: pytest.FixtureRequest,
+        execution_properties: ExecutionProperties,
+        framework_properties: FrameworkProperties,
+        appium_properties: AppiumProperties,
+        driver,
+        logger: logging.Logger,
+        test_data_manager: DataManager,
+        attachments: Attachments
+    ):
+        """Set up the test with session resources, attachments and recording"""
+        self.execution_properties = execution_properties
+        self.framework_properties = framework_properties
+        self.appium_properties = appium_properties
+        self.driver = driver
+        self.logger = logger
+        self.test_data_manager = test_data_manager
+        self.attachments = attachments
+        self.is_rerun = getattr(request.node, 'execution_count', 1) > 1
+        self.artifact_cache_dir = artifact_cache_dir(request.node, execution_properties)
+        self.artifacts_cached = has_cached_artifacts(request.node, self.artifact_cache_dir)
 
         self._start_recording()
 
+    def _should_record(self) -> bool:
+        """Check whether the record mode asks for a recording of this run"""
+        record_mode = self.execution_properties.record_mode
+        if record_mode == RecordMode.ON_FAILURE:
+            return self.is_rerun
+        return record_mode == RecordMode.ALWAYS
+
     def _start_recording(self):
-        """Start screen recording based on platform"""
-        if self.appium_properties.platform == PlatformType.ANDROID:
-            self.driver.execute_script('mobile: startMediaProjectionRecording')
-        elif (
-            self.appium_properties.platform == PlatformType.IOS and
-            self.execution_properties.provider != ProviderType.SAUCELABS
+        """Start screen recording based on platform and record mode"""
+        self.recording_started = False
+        execution_properties = self.execution_properties
+        # Sauce Labs records its own video, so device recordings would be discarded
+        if (
+            execution_properties.mode == ExecutionMode.PLAYBACK or
+            execution_properties.provider == ProviderType.SAUCELABS or
+            not self._should_record()
         ):
+            return
+        platform = self.appium_properties.platform
+        if platform == PlatformType.ANDROID:
+            self.driver.execute_script('mobile: startMediaProjectionRecording')
+            self.recording_started = True
+        elif platform == PlatformType.IOS:
             self.driver.start_recording_screen()
+            self.recording_started = True
+
+    def capture_artifacts(self, include_screenshot=False, passed=False):
+        """Capture test artifacts like logs and recordings, reusing cached ones for passes"""
+        # Playback backends replay recorded responses, so their artifacts carry no information
+        if self.execution_properties.mode == ExecutionMode.PLAYBACK:
+            return
+        attachments = self.attachments
+        cache_dir = self.artifact_cache_dir
+        # Cache hits still record, since an unchanged test that now fails needs its video
+        if passed and self.artifacts_cached:
+            if self.recording_started:
+                attachments.discard_recording()
+            attachments.attach_cached(cache_dir)
+            return
+
+        saved = attachments.attach_all(
+            include_recording=self.recording_started,
+            include_screenshot=include_screenshot
+        )
+        if passed and cache_dir is not None:
+            attachments.store_cached(saved, cache_dir)
 
-    def capture_artifacts(self, include_screenshot=False):
-        """Capture test artifacts like logs and recordings"""
-        platform = self.appium_properties.platform
-        self.attachments.attach_logs(platform)
-        self.attachments.attach_session_id()
+class TestRecording:
+    """Test cases for deciding when screen recordings are started"""
+
+    @staticmethod
+    def make_test_case(record_mode: RecordMode, is_rerun: bool) -> BaseTestCase:
+        """Build a test case with just the state the recording decision reads"""
+        test_case = BaseTestCase()
+        test_case.execution_properties = ExecutionProperties(record_mode=record_mode)
+        test_case.appium_properties = AppiumProperties(platform=PlatformType.ANDROID)
+        test_case.driver = Mock()
+        test_case.is_rerun = is_rerun
+        test_case.artifacts_cached = False
+        test_case.artifact_cache_dir = None
+        test_case.attachments = Mock(spec=Attachments)
+        return test_case
+
+    def test_on_failure_records_reruns_only(self):
+        """Verify on-failure records the rerun of a failed test but not its first run"""
+        first_run = self.make_test_case(RecordMode.ON_FAILURE, is_rerun=False)
+        first_run._start_recording()
+        assert not first_run.recording_started
+        first_run.driver.execute_script.assert_not_called()
+
+        rerun = self.make_test_case(RecordMode.ON_FAILURE, is_rerun=True)
+        rerun._start_recording()
+        assert rerun.recording_started
+        rerun.driver.execute_script.assert_called_once_with('mobile: startMediaProjectionRecording')
+
+    def test_never_does_not_record(self):
+        """Verify never records neither first runs nor reruns"""
+        for is_rerun in (False, True):
+            test_case = self.make_test_case(RecordMode.NEVER, is_rerun)
+            test_case._start_recording()
+            assert not test_case.recording_started
+            test_case.driver.execute_script.assert_not_called()
+
+    def test_cache_hit_that_fails_keeps_recording(self):
+        """Verify an unchanged test with cached artifacts is recorded and, on failure, attached"""
+        test_case = self.make_test_case(RecordMode.ALWAYS, is_rerun=False)
+        test_case.artifacts_cached = True
+        test_case._start_recording()
+        assert test_case.recording_started
+
+        test_case.capture_artifacts(include_screenshot=True, passed=False)
+
+        test_case.attachments.attach_all.assert_called_once_with(
+            include_recording=True, include_screenshot=True
+        )
+        test_case.attachments.attach_cached.assert_not_called()
 
-        if self.execution_properties.provider != ProviderType.SAUCELABS:
-            self.attachments.attach_recording(platform)
+    def test_cache_hit_that_passes_discards_recording(self):
+        """Verify a passing cache hit stops its recording and attaches the cached artifacts"""
+        test_case = self.make_test_case(RecordMode.ALWAYS, is_rerun=False)
+        test_case.artifacts_cached = True
+        test_case._start_recording()
 
-        if include_screenshot:
-            self.attachments.attach_screenshot()
+        test_case.capture_artifacts(passed=True)
 
-    def tearDown(self):
-        """Clean up test case and capture artifacts"""
-        self.capture_artifacts()
-        if self.driver:
-            self.driver.quit()
+        test_case.attachments.discard_recording.assert_called_once_with()
+        test_case.attachments.attach_cached.assert_called_once_with(None)
+        test_case.attachments.attach_all.assert_not_called()